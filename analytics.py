@@ -0,0 +1,253 @@
+from datetime import datetime, timedelta
+import numpy as np
+from sqlalchemy import case, func
+from sqlalchemy.exc import IntegrityError
+from models import db, DailyMood, Entry, UserStats
+
+SENTIMENT_LABELS = ('positive', 'neutral', 'negative')
+TIMESERIES_BUCKETS = ('day', 'week', 'month')
+
+def entry_aggregates(*criteria):
+    """
+    Compute mood and sentiment aggregates in a single SQL round trip
+    
+    Args:
+        *criteria: Optional SQLAlchemy filter expressions on Entry
+    
+    Returns:
+        dict: Scalar aggregates (count, sums, average, variance, label histogram)
+    """
+    query = db.session.query(
+        func.count(Entry.id),
+        func.coalesce(func.sum(Entry.mood_rating), 0),
+        func.coalesce(func.sum(Entry.mood_rating * Entry.mood_rating), 0),
+        func.coalesce(func.sum(case((Entry.mood_rating >= 4, 1), else_=0)), 0),
+        *(func.coalesce(func.sum(case((Entry.sentiment_label == label, 1), else_=0)), 0)
+          for label in SENTIMENT_LABELS)
+    )
+    if criteria:
+        query = query.filter(*criteria)
+    
+    count, mood_sum, mood_sum_sq, positive_entries, *label_counts = query.one()
+    avg_mood = mood_sum / count if count else 0.0
+    variance = max(mood_sum_sq / count - avg_mood ** 2, 0.0) if count else 0.0
+    
+    return {
+        'count': count,
+        'mood_sum': mood_sum,
+        'mood_sum_sq': mood_sum_sq,
+        'avg_mood': avg_mood,
+        'mood_variance': variance,
+        'positive_entries': positive_entries,
+        'label_counts': dict(zip(SENTIMENT_LABELS, label_counts))
+    }
+
+def recent_activity(recent_count=7, days=7):
+    """
+    Average mood of the latest entries and number of entries in the last few days
+    
+    Both windows are answered from the timestamp index in one round trip.
+    """
+    latest = (db.session.query(Entry.mood_rating)
+              .order_by(Entry.timestamp.desc())
+              .limit(recent_count)
+              .subquery())
+    recent_avg = db.session.query(func.avg(latest.c.mood_rating)).scalar_subquery()
+    week_count = (db.session.query(func.count(Entry.id))
+                  .filter(Entry.timestamp > datetime.utcnow() - timedelta(days=days))
+                  .scalar_subquery())
+    
+    recent_avg, week_count = db.session.query(recent_avg, week_count).one()
+    return (recent_avg or 0.0), week_count
+
+def streaks_from_dates(dates):
+    """
+    Compute streaks from distinct entry dates sorted newest first
+    
+    Returns:
+        tuple: (length of the run ending at the newest date, longest run)
+    """
+    if not len(dates):
+        return 0, 0
+    
+    ordinals = np.fromiter((date.toordinal() for date in dates), dtype=np.int64, count=len(dates))
+    # A new run starts wherever the gap to the next newer date is more than one day
+    starts = np.flatnonzero(np.diff(ordinals) != -1) + 1
+    runs = np.diff(np.concatenate(([0], starts, [len(ordinals)])))
+    return int(runs[0]), int(runs.max())
+
+def set_streaks(stats, dates):
+    """Reset the streaks on the stats row from distinct entry dates sorted newest first"""
+    current, longest = streaks_from_dates(dates)
+    stats.set_streaks(current, longest, dates[0] if dates else None)
+
+def entry_dates():
+    """Distinct entry dates, newest first, read from the idx_entries_date expression index"""
+    entry_date = func.date(Entry.timestamp, type_=db.Date)
+    return [date for (date,) in db.session.query(entry_date).distinct().order_by(entry_date.desc())]
+
+def lock_for_write():
+    """
+    Take the database write lock before reading rows that are about to be updated
+    
+    SQLite ignores SELECT ... FOR UPDATE and pysqlite only opens a transaction
+    at the first write, so a read-modify-write of the aggregates would race
+    with other writers. BEGIN IMMEDIATE makes concurrent writers queue up
+    instead. A transaction that is already open has written, so it holds the
+    lock already. Other databases rely on FOR UPDATE.
+    """
+    connection = db.session.connection()
+    if connection.dialect.name != 'sqlite':
+        return
+    if not connection.connection.dbapi_connection.in_transaction:
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+def load_stats(for_update=False):
+    """Load the running aggregates, rebuilding them from the entries table if missing"""
+    if for_update:
+        lock_for_write()
+    stats = db.session.get(UserStats, UserStats.SINGLETON_ID,
+                           with_for_update=for_update, populate_existing=for_update)
+    if stats is None:
+        stats = rebuild_stats()
+    return stats
+
+def rebuild_stats():
+    """Recompute the running aggregates from scratch"""
+    lock_for_write()
+    stats = db.session.get(UserStats, UserStats.SINGLETON_ID,
+                           with_for_update=True, populate_existing=True)
+    if stats is None:
+        stats = create_stats()
+    
+    with db.session.no_autoflush:
+        stats.apply_aggregates(entry_aggregates())
+        set_streaks(stats, entry_dates())
+        rebuild_daily_mood()
+    
+    stats.touch()
+    return stats
+
+def create_stats():
+    """
+    Insert the stats row, or load it if another writer created it first
+    
+    FOR UPDATE cannot lock a row that does not exist yet, so on databases
+    other than SQLite (where lock_for_write already serializes writers) two
+    first rebuilds may both insert. The insert runs in a savepoint so the
+    loser just reads the winner's row.
+    """
+    try:
+        with db.session.begin_nested():
+            stats = UserStats(id=UserStats.SINGLETON_ID)
+            db.session.add(stats)
+    except IntegrityError:
+        stats = db.session.get(UserStats, UserStats.SINGLETON_ID,
+                               with_for_update=True, populate_existing=True)
+    return stats
+
+def rebuild_daily_mood():
+    """Recompute the daily_mood rollup from the entries table in one INSERT ... SELECT"""
+    entry_date = func.date(Entry.timestamp, type_=db.Date)
+    complete = Entry.sentiment_status == 'complete'
+    db.session.execute(db.delete(DailyMood))
+    db.session.execute(db.insert(DailyMood).from_select(
+        ['date', 'entry_count', 'mood_sum', 'mood_sum_sq', 'positive_count', 'neutral_count',
+         'negative_count', 'sentiment_sum'],
+        db.select(
+            entry_date,
+            func.count(Entry.id),
+            func.sum(Entry.mood_rating),
+            func.sum(Entry.mood_rating * Entry.mood_rating),
+            *(func.sum(case((Entry.sentiment_label == label, 1), else_=0)) for label in SENTIMENT_LABELS),
+            func.coalesce(func.sum(case((complete, Entry.sentiment_score), else_=0.0)), 0.0)
+        ).group_by(entry_date)
+    ))
+
+def record_entries(entries):
+    """
+    Fold new entries into the running aggregates
+    
+    Must be called before the entries are added to the session so that a
+    first-time rebuild of the stats row does not count them twice.
+    """
+    stats = load_stats(for_update=True)
+    backdated = False
+    for entry in sorted(entries, key=lambda entry: entry.timestamp):
+        stats.add_mood(entry.mood_rating)
+        stats.add_sentiment(entry.sentiment_label)
+        if not stats.add_entry_date(entry.timestamp.date()):
+            backdated = True
+    
+        day = DailyMood.for_date(entry.timestamp.date())
+        day.add_mood(entry.mood_rating)
+        if entry.sentiment_status != 'pending':
+            day.add_sentiment(entry.sentiment_label, entry.sentiment_score)
+    
+    if backdated:
+        # Back-dated entries: recompute streaks over all entry dates once
+        with db.session.no_autoflush:
+            dates = set(entry_dates())
+        dates.update(entry.timestamp.date() for entry in entries)
+        set_streaks(stats, sorted(dates, reverse=True))
+    
+    stats.touch()
+    return stats
+
+def record_entry(entry):
+    """Fold a single new entry into the running aggregates"""
+    return record_entries([entry])
+
+def record_sentiment(timestamp, label, score, delta=1):
+    """Count (or with delta=-1 uncount) an entry's sentiment once its analysis completes"""
+    stats = load_stats(for_update=True)
+    stats.add_sentiment(label, delta)
+    stats.touch()
+    DailyMood.for_date(timestamp.date()).add_sentiment(label, score, delta)
+
+def mood_timeseries(start, end, bucket='day'):
+    """
+    Mood and sentiment per day, week or month, read from the daily_mood rollup
+    
+    Args:
+        start (date): First day included
+        end (date): Last day included
+        bucket (str): One of TIMESERIES_BUCKETS; weeks start on Monday
+    
+    Returns:
+        list: One dict per period with entries, newest last
+    """
+    if bucket not in TIMESERIES_BUCKETS:
+        raise ValueError(f"Bucket must be one of: {', '.join(TIMESERIES_BUCKETS)}")
+    
+    days = (DailyMood.query
+            .filter(DailyMood.date >= start, DailyMood.date <= end)
+            .order_by(DailyMood.date))
+    
+    periods = {}
+    for day in days:
+        if bucket == 'week':
+            period = day.date - timedelta(days=day.date.weekday())
+        elif bucket == 'month':
+            period = day.date.replace(day=1)
+        else:
+            period = day.date
+        totals = periods.setdefault(period, [0, 0, 0, 0, 0, 0, 0.0])
+        for index, value in enumerate((day.entry_count, day.mood_sum, day.mood_sum_sq,
+                                       day.positive_count, day.neutral_count,
+                                       day.negative_count, day.sentiment_sum)):
+            totals[index] += value
+    
+    series = []
+    for period, (count, mood_sum, mood_sum_sq, positive, neutral, negative, sentiment_sum) in periods.items():
+        avg_mood = mood_sum / count
+        labelled = positive + neutral + negative
+        series.append({
+            'period': period.isoformat(),
+            'entries': count,
+            'avg_mood': round(avg_mood, 2),
+            'mood_std': round(max(mood_sum_sq / count - avg_mood ** 2, 0.0) ** 0.5, 2),
+            'sentiment': {'positive': positive, 'neutral': neutral, 'negative': negative},
+            'avg_sentiment': round(sentiment_sum / labelled, 3) if labelled else None
+        })
+    return series
@@ -1,17 +1,104 @@
-from flask import Flask, render_template, request, jsonify
+from flask import (Flask, Response, render_template, request, jsonify, url_for, make_response,
+                   stream_with_context)
+import click
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
+from functools import wraps
 import os
 from config import Config
-from models import db, Entry
+from models import db, Entry, UserStats
+from analytics import load_stats, mood_timeseries, rebuild_stats, record_entry, record_entries
+from insights import generate_psychology_insights, stats_summary
 from sentiment_analyzer import SentimentAnalyzer
+from cache import LRUCache, SQLiteStore
+from sentiment_worker import SentimentWorker
+from rescore import rescore_entries
+from backfill import backfill_entries
+from export import EXPORT_FORMATS, export_chunks
+from migrations import upgrade_schema
 
 app = Flask(__name__)
 app.config.from_object(Config)
 
 # Initialize extensions
 db.init_app(app)
-sentiment_analyzer = SentimentAnalyzer()
+sentiment_cache = LRUCache(
+    max_size=app.config['SENTIMENT_CACHE_SIZE'],
+    ttl=app.config['SENTIMENT_CACHE_TTL'],
+    store=SQLiteStore(app.config['SENTIMENT_CACHE_PATH'], table='sentiment_cache',
+                      ttl=app.config['SENTIMENT_CACHE_TTL'])
+          if app.config['SENTIMENT_CACHE_PATH'] else None
+)
+analytics_cache = LRUCache(
+    max_size=app.config['ANALYTICS_CACHE_SIZE'],
+    store=SQLiteStore(app.config['ANALYTICS_CACHE_PATH'], table='analytics_cache', max_rows=1000)
+          if app.config['ANALYTICS_CACHE_PATH'] else None
+)
+sentiment_analyzer = SentimentAnalyzer(
+    cache=sentiment_cache,
+    nltk_data_path=app.config['NLTK_DATA_PATH'],
+    offline=app.config['NLTK_OFFLINE'],
+    weights=app.config['SENTIMENT_WEIGHTS'],
+    profile=app.config['SENTIMENT_PROFILE'],
+    cascade_threshold=app.config['SENTIMENT_CASCADE_THRESHOLD'],
+    label_threshold=app.config['SENTIMENT_LABEL_THRESHOLD']
+)
+if app.config['SENTIMENT_WARMUP']:
+    load_times = sentiment_analyzer.warm_up()
+    app.logger.info("Sentiment analyzer warmed up: %s",
+                    ', '.join(f"{name} {seconds:.3f}s" for name, seconds in load_times.items()))
+sentiment_worker = SentimentWorker(app, sentiment_analyzer, app.config['SENTIMENT_WORKERS'])
+
+def conditional_get(daily=False):
+    """
+    Serve ETag/Last-Modified from the stats row's data_version
+    
+    Conditional requests whose data has not changed get a 304 before the view
+    runs any other query.
+    
+    Args:
+        daily (bool): Responses also depend on today's date (streaks, default ranges)
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+            
+            version = (db.session.query(UserStats.data_version, UserStats.last_updated)
+                       .filter(UserStats.id == UserStats.SINGLETON_ID)
+                       .first())
+            if version is None:
+                # Nothing recorded yet (or stats not built); serve without validators
+                return view(*args, **kwargs)
+            
+            # The counter restarts when the database is recreated; last_updated tells
+            # the generations apart so old validators never match new data
+            etag = f"{version.data_version}-{version.last_updated.strftime('%Y%m%d%H%M%S%f')}"
+            if daily:
+                # Same clock as the stored (UTC) timestamps and the default date ranges
+                etag += f'-{datetime.utcnow().date().isoformat()}'
+            last_modified = version.last_updated.replace(tzinfo=timezone.utc, microsecond=0)
+            
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            else:
+                not_modified = (not daily and request.if_modified_since is not None
+                                and request.if_modified_since >= last_modified)
+            
+            if not_modified:
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            
+            response.set_etag(etag, weak=True)
+            response.last_modified = last_modified
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
 
 @app.route('/')
 def index():
@@ -19,46 +106,51 @@ def index():
     return render_template('index.html')
 
 @app.route('/api/entries', methods=['GET', 'POST'])
+@conditional_get()
 def handle_entries():
-    """Handle journal entries - GET all entries or POST new entry"""
+    """Handle journal entries - GET a page of entries or POST new entry"""
     if request.method == 'POST':
+        # Validate input
         try:
-            data = request.get_json()
-            
-            # Validate input
-            if not data or 'mood' not in data or 'content' not in data:
-                return jsonify({'success': False, 'error': 'Missing required fields'}), 400
-            
-            mood_rating = data['mood']
-            content = data['content'].strip()
-            
-            # Validate mood rating
-            if not isinstance(mood_rating, int) or mood_rating < 1 or mood_rating > 5:
-                return jsonify({'success': False, 'error': 'Mood rating must be between 1 and 5'}), 400
-            
-            if not content:
-                return jsonify({'success': False, 'error': 'Content cannot be empty'}), 400
-            
-            # Analyze sentiment
-            sentiment_result = sentiment_analyzer.analyze(content)
+            mood_rating, content, _ = parse_entry(request.get_json(silent=True))
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
             
+        try:
             # Create new entry
             entry = Entry(
                 mood_rating=mood_rating,
                 content=content,
-                sentiment_score=sentiment_result['compound_score'],
-                sentiment_label=sentiment_result['sentiment_label'],
                 timestamp=datetime.utcnow()
             )
             
-            # Save to database
+            if app.config['SENTIMENT_ASYNC']:
+                # Commit right away and let the background worker fill in the sentiment
+                entry.sentiment_score = 0.0
+                entry.sentiment_status = 'pending'
+            else:
+                entry.apply_sentiment(sentiment_analyzer.analyze(content))
+            
+            # Save to database, updating the running aggregates in the same transaction
+            record_entry(entry)
             db.session.add(entry)
             db.session.commit()
+            analytics_cache.clear()
+            
+            if entry.sentiment_status == 'pending':
+                sentiment_worker.submit(entry.id, content)
+                return jsonify({
+                    'success': True,
+                    'entry_id': entry.id,
+                    'sentiment': None,
+                    'sentiment_status': 'pending'
+                }), 202
             
             return jsonify({
                 'success': True, 
                 'entry_id': entry.id,
-                'sentiment': sentiment_result['sentiment_label']
+                'sentiment': entry.sentiment_label,
+                'sentiment_status': entry.sentiment_status
             })
             
         except Exception as e:
@@ -66,21 +158,195 @@ def handle_entries():
             print(f"Error saving entry: {e}")
             return jsonify({'success': False, 'error': 'Internal server error'}), 500
     
-    # GET request - return all entries
+    # GET request - return one page of entries, newest first
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        fields = parse_fields(request.args.get('fields'))
+        entries, next_cursor = Entry.page(limit, request.args.get('cursor'), fields)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     try:
-        entries = Entry.query.order_by(Entry.timestamp.desc()).all()
-        return jsonify([entry.to_dict() for entry in entries])
+        response = jsonify([entry.to_dict(fields) for entry in entries])
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+            response.headers['Link'] = '<{}>; rel="next"'.format(
+                url_for('handle_entries', cursor=next_cursor, limit=limit,
+                        fields=request.args.get('fields'))
+            )
+        return response
     except Exception as e:
         print(f"Error fetching entries: {e}")
         return jsonify([])
 
+@app.route('/api/entries/bulk', methods=['POST'])
+def bulk_create_entries():
+    """Import many entries at once, analyzing their sentiment as a batch"""
+    data = request.get_json(silent=True)
+    items = data.get('entries') if isinstance(data, dict) else data
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({'success': False, 'error': 'Expected a non-empty list of entries'}), 400
+    
+    if len(items) > app.config['BULK_MAX_ENTRIES']:
+        return jsonify({
+            'success': False,
+            'error': f"At most {app.config['BULK_MAX_ENTRIES']} entries per request"
+        }), 400
+    
+    parsed = []
+    for index, item in enumerate(items):
+        try:
+            parsed.append(parse_entry(item))
+        except ValueError as e:
+            return jsonify({'success': False, 'error': f'Entry {index}: {e}'}), 400
+    
+    try:
+        results = sentiment_analyzer.analyze_batch(
+            [content for _, content, _ in parsed],
+            processes=app.config['SENTIMENT_BATCH_PROCESSES']
+        )
+        
+        now = datetime.utcnow()
+        entries = []
+        for (mood_rating, content, timestamp), result in zip(parsed, results):
+            entry = Entry(mood_rating=mood_rating, content=content, timestamp=timestamp or now)
+            entry.apply_sentiment(result)
+            entries.append(entry)
+        
+        record_entries(entries)
+        db.session.add_all(entries)
+        db.session.commit()
+        analytics_cache.clear()
+        
+        return jsonify({
+            'success': True,
+            'entry_ids': [entry.id for entry in entries],
+            'sentiments': [entry.sentiment_label for entry in entries]
+        })
+    
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error importing entries: {e}")
+        return jsonify({'success': False, 'error': 'Internal server error'}), 500
+
+@app.route('/api/entries/export')
+@conditional_get()
+def export_entries():
+    """Download every entry as NDJSON, a JSON array or CSV, streamed in constant memory"""
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"Format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+    try:
+        fields = parse_fields(request.args.get('fields')) or Entry.FIELDS
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    extension = 'jsonl' if export_format == 'ndjson' else export_format
+    return Response(
+        stream_with_context(export_chunks(export_format, fields)),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename=moodmate-entries.{extension}'}
+    )
+
+@app.route('/api/entries/<int:entry_id>')
+def get_entry(entry_id):
+    """Get a single entry, e.g. to poll the status of background sentiment analysis"""
+    entry = db.session.get(Entry, entry_id)
+    if entry is None:
+        return jsonify({'error': 'Not found'}), 404
+    return jsonify(entry.to_dict(Entry.FIELDS + Entry.SCORE_FIELDS))
+
+@app.route('/api/entries/<int:entry_id>/summary')
+def get_entry_summary(entry_id):
+    """Get a human-readable sentiment summary built from the entry's stored scores"""
+    entry = db.session.get(Entry, entry_id)
+    if entry is None:
+        return jsonify({'error': 'Not found'}), 404
+    if entry.sentiment_status != 'complete':
+        return jsonify({
+            'error': 'Sentiment analysis not complete',
+            'sentiment_status': entry.sentiment_status
+        }), 409
+    
+    if entry.sentiment_confidence is None:
+        # Stored before component scores were kept; the analyzer's cache makes repeats cheap
+        result = sentiment_analyzer.analyze(entry.content)
+    else:
+        result = entry.sentiment_result()
+    return jsonify(sentiment_analyzer.get_sentiment_summary(result=result))
+
+def parse_entry(data):
+    """
+    Validate a submitted entry
+    
+    Returns:
+        tuple: (mood rating, stripped content, timestamp or None)
+    """
+    if not isinstance(data, dict) or 'mood' not in data or 'content' not in data:
+        raise ValueError('Missing required fields')
+    
+    mood_rating = data['mood']
+    content = data['content'].strip() if isinstance(data['content'], str) else ''
+    
+    # Validate mood rating
+    if not isinstance(mood_rating, int) or mood_rating < 1 or mood_rating > 5:
+        raise ValueError('Mood rating must be between 1 and 5')
+    
+    if not content:
+        raise ValueError('Content cannot be empty')
+    
+    # Imports may carry their original timestamp; stored as naive UTC like utcnow()
+    timestamp = None
+    if data.get('timestamp'):
+        try:
+            timestamp = datetime.fromisoformat(data['timestamp'])
+        except (TypeError, ValueError):
+            raise ValueError('Timestamp must be an ISO 8601 string')
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    return mood_rating, content, timestamp
+
+def parse_limit(value):
+    """Parse the page size query parameter, clamped to the configured maximum"""
+    if value is None:
+        return app.config['ENTRIES_PAGE_SIZE']
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if limit < 1:
+        raise ValueError('limit must be positive')
+    return min(limit, app.config['ENTRIES_MAX_PAGE_SIZE'])
+
+def parse_fields(value):
+    """Parse the comma-separated field projection query parameter"""
+    if not value:
+        return None
+    fields = tuple(name.strip() for name in value.split(',') if name.strip())
+    unknown = [name for name in fields if name not in Entry.FIELDS + Entry.SCORE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
 @app.route('/api/analytics')
+@conditional_get(daily=True)
 def get_analytics():
     """Get analytics and insights for the dashboard"""
     try:
-        entries = Entry.query.all()
+        stats = load_stats()
+        # Results only change with the data or the calendar day (streaks, last 7 days);
+        # last_updated keeps keys unique if the database is ever reset
+        cache_key = (f"analytics:{stats.data_version}:{stats.last_updated.isoformat()}:"
+                     f"{datetime.utcnow().date().isoformat()}")
+        db.session.commit()
         
-        if not entries:
+        cached = analytics_cache.get(cache_key)
+        if cached is not None:
+            return jsonify(cached)
+        
+        if not stats.total_entries:
             return jsonify({
                 'total_entries': 0,
                 'avg_mood': 0.0,
@@ -89,27 +355,29 @@ def get_analytics():
                 'insights': []
             })
         
-        # Calculate basic statistics
-        total_entries = len(entries)
-        avg_mood = sum(entry.mood_rating for entry in entries) / total_entries
-        positive_entries = sum(1 for entry in entries if entry.mood_rating >= 4)
-        positive_ratio = round((positive_entries / total_entries) * 100)
+        # Basic statistics come straight from the running aggregates
+        total_entries = stats.total_entries
+        avg_mood = stats.mood_sum / total_entries
+        positive_ratio = round((stats.positive_entries / total_entries) * 100)
         
         # Calculate current streak
-        streak_days = calculate_journal_streak(entries)
+        streak_days = stats.streak_days()
         
         # Generate psychology insights
-        insights = generate_psychology_insights(entries)
+        insights = generate_psychology_insights(stats_summary(stats))
         
-        return jsonify({
+        analytics = {
             'total_entries': total_entries,
             'avg_mood': round(avg_mood, 1),
             'streak_days': streak_days,
             'positive_ratio': positive_ratio,
             'insights': insights
-        })
+        }
+        analytics_cache.set(cache_key, analytics)
+        return jsonify(analytics)
         
     except Exception as e:
+        db.session.rollback()
         print(f"Error calculating analytics: {e}")
         return jsonify({
             'total_entries': 0,
@@ -119,121 +387,42 @@ def get_analytics():
             'insights': []
         })
 
-def calculate_journal_streak(entries):
-    """Calculate consecutive days of journaling"""
-    if not entries:
-        return 0
-    
-    # Sort entries by date (newest first)
-    sorted_entries = sorted(entries, key=lambda x: x.timestamp, reverse=True)
-    
-    # Get unique dates
-    entry_dates = []
-    for entry in sorted_entries:
-        date = entry.timestamp.date()
-        if date not in entry_dates:
-            entry_dates.append(date)
-    
-    if not entry_dates:
-        return 0
-    
-    # Calculate streak
-    streak = 0
-    today = datetime.now().date()
-    current_date = today
-    
-    # Check if user journaled today or yesterday (to account for time differences)
-    if entry_dates[0] == today:
-        streak = 1
-        current_date = today - timedelta(days=1)
-    elif entry_dates[0] == today - timedelta(days=1):
-        streak = 1
-        current_date = today - timedelta(days=2)
-    else:
-        return 0
-    
-    # Count consecutive days
-    for date in entry_dates[1:]:
-        if date == current_date:
-            streak += 1
-            current_date -= timedelta(days=1)
-        else:
-            break
-    
-    return streak
-
-def generate_psychology_insights(entries):
-    """Generate CBT-inspired insights based on journal entries"""
-    insights = []
-    
-    if len(entries) < 3:
-        return [{
-            'title': 'Building Self-Awareness 🧠',
-            'content': f"You've made {len(entries)} journal entries! Each entry contributes to better self-understanding. Regular journaling is a cornerstone of emotional wellness and cognitive behavioral therapy (CBT)."
-        }]
-    
-    recent_entries = sorted(entries, key=lambda x: x.timestamp, reverse=True)[:7]
-    all_moods = [entry.mood_rating for entry in entries]
-    recent_moods = [entry.mood_rating for entry in recent_entries]
-    
-    avg_mood = sum(all_moods) / len(all_moods)
-    recent_avg = sum(recent_moods) / len(recent_moods)
-    
-    # Mood trend analysis
-    if recent_avg > avg_mood + 0.5:
-        insights.append({
-            'title': 'Positive Momentum Detected 📈',
-            'content': 'Your recent entries show an upward trend in mood! This suggests that recent changes in your life, thoughts, or behaviors are having a positive impact. Consider what factors might be contributing to this improvement and how you can maintain them.'
-        })
-    elif recent_avg < avg_mood - 0.5:
-        insights.append({
-            'title': 'CBT Reflection Opportunity 🤔',
-            'content': 'Your recent entries show some challenging periods. Remember that temporary setbacks are normal and part of the human experience. Try identifying any negative thought patterns and practice reframing them with evidence-based thinking.'
-        })
-    
-    # Sentiment analysis insights
-    positive_sentiment = sum(1 for entry in entries if entry.sentiment_label == 'positive')
-    negative_sentiment = sum(1 for entry in entries if entry.sentiment_label == 'negative')
-    
-    if positive_sentiment > negative_sentiment * 1.5:
-        insights.append({
-            'title': 'Positive Language Patterns 😊',
-            'content': 'Your journal entries show predominantly positive language patterns. This indicates good emotional regulation and optimistic thinking patterns, which are protective factors for mental health according to positive psychology research.'
-        })
-    elif negative_sentiment > positive_sentiment:
-        insights.append({
-            'title': 'Cognitive Reframing Practice 🔄',
-            'content': 'Your entries show some negative language patterns. Try the CBT technique of examining one negative thought per day: What evidence supports this thought? What evidence challenges it? What would you tell a friend in this situation?'
-        })
-    
-    # Consistency insight
-    if len(entries) >= 7:
-        recent_week_entries = [e for e in entries if e.timestamp > datetime.now() - timedelta(days=7)]
-        if len(recent_week_entries) >= 5:
-            insights.append({
-                'title': 'Excellent Consistency! 🌟',
-                'content': 'You\'ve been journaling regularly this week! Consistent self-reflection is a key component of emotional wellness and is strongly supported by psychological research on habit formation and mindfulness.'
-            })
-    
-    # Mood variability insight
-    if len(entries) >= 10:
-        mood_variance = sum((mood - avg_mood) ** 2 for mood in all_moods) / len(all_moods)
-        mood_std = mood_variance ** 0.5
-        
-        if mood_std > 1.2:
-            insights.append({
-                'title': 'Emotional Range Awareness 📊',
-                'content': 'Your mood shows natural variation over time, which is completely normal. If you notice significant swings, consider tracking potential triggers like sleep quality, stress levels, or major life events to identify patterns.'
-            })
-    
-    # Default insight if no specific patterns detected
-    if not insights:
-        insights.append({
-            'title': 'Steady Progress 🎯',
-            'content': f'You\'ve maintained an average mood of {avg_mood:.1f}/5 across {len(entries)} entries. This consistent self-monitoring is building emotional intelligence and self-awareness - key components of psychological well-being.'
-        })
+@app.route('/api/analytics/timeseries')
+@conditional_get(daily=True)
+def get_timeseries():
+    """Mood and sentiment per day, week or month, for charts"""
+    try:
+        end = parse_date(request.args.get('to')) or datetime.utcnow().date()
+        start = parse_date(request.args.get('from')) or end - timedelta(days=364)
+        if start > end:
+            raise ValueError("'from' must not be after 'to'")
+        series = mood_timeseries(start, end, request.args.get('bucket', 'day'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    return insights
+    return jsonify({
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'bucket': request.args.get('bucket', 'day'),
+        'series': series
+    })
+
+def parse_date(value):
+    """Parse an optional YYYY-MM-DD query parameter"""
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f'Invalid date: {value}')
+
+@app.route('/api/metrics/cache')
+def get_cache_metrics():
+    """Hit rates and sizes of the sentiment and analytics caches"""
+    return jsonify({
+        'sentiment': sentiment_cache.stats(),
+        'analytics': analytics_cache.stats()
+    })
 
 @app.errorhandler(404)
 def not_found(error):
@@ -244,11 +433,54 @@ def internal_error(error):
     db.session.rollback()
     return jsonify({'error': 'Internal server error'}), 500
 
+@app.cli.command('upgrade-db')
+def upgrade_db_command():
+    """Create missing tables, columns and indexes in an existing database"""
+    changes = upgrade_schema()
+    for change in changes:
+        click.echo(change)
+    click.echo(f"Database is up to date ({len(changes)} changes)")
+
+@app.cli.command('rebuild-stats')
+def rebuild_stats_command():
+    """Recompute the running aggregates and daily rollup from the entries table"""
+    stats = rebuild_stats()
+    db.session.commit()
+    click.echo(f"Rebuilt aggregates over {stats.total_entries} entries")
+
+@app.cli.command('rescore')
+@click.option('--batch-size', default=5000, show_default=True, help='Entries per UPDATE batch')
+def rescore_command(batch_size):
+    """Recompute sentiment scores and labels from stored component scores"""
+    counts = rescore_entries(sentiment_analyzer, batch_size)
+    click.echo(f"Rescored {counts['scanned']} entries: {counts['updated']} updated, "
+               f"{counts['skipped']} without component scores skipped")
+
+@app.cli.command('backfill')
+@click.option('--chunk-size', default=500, show_default=True, help='Entries per transaction')
+@click.option('--processes', type=int, help='Analyzer processes [default: SENTIMENT_BATCH_PROCESSES]')
+@click.option('--checkpoint', help='Progress file for resuming [default: instance/backfill.json]')
+@click.option('--limit', type=int, help='Stop after this many entries')
+def backfill_command(chunk_size, processes, checkpoint, limit):
+    """Re-analyze entries scored by an older analyzer version"""
+    if checkpoint is None:
+        os.makedirs(app.instance_path, exist_ok=True)
+        checkpoint = os.path.join(app.instance_path, 'backfill.json')
+    if processes is None:
+        processes = app.config['SENTIMENT_BATCH_PROCESSES']
+    
+    count = backfill_entries(sentiment_analyzer, chunk_size, processes, checkpoint, limit, click.echo)
+    click.echo(f"Backfilled {count} entries to analyzer version {sentiment_analyzer.model_version}")
+
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all()
+        upgrade_schema()
         print("Database initialized successfully!")
         print("Starting MoodMate server...")
         print("Open http://localhost:5000 in your browser")
     
+    if app.config['SENTIMENT_ASYNC']:
+        # Pick up entries that were still queued when the server last stopped
+        sentiment_worker.requeue_pending()
+    
     app.run(debug=True, host='0.0.0.0', port=5000)
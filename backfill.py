@@ -0,0 +1,100 @@
+import json
+import os
+import time
+from sqlalchemy import or_, select, update
+from models import db, DailyMood, Entry
+from analytics import load_stats
+
+def stale_entries(version):
+    """Filter matching analyzed entries whose scores came from another analyzer version"""
+    return (
+        Entry.sentiment_status.in_(('complete', 'failed')),
+        or_(Entry.analyzer_version.is_(None), Entry.analyzer_version != version)
+    )
+
+def read_checkpoint(path, version):
+    """Return the last backfilled id recorded for this analyzer version, or 0"""
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        checkpoint = json.load(f)
+    return checkpoint['last_id'] if checkpoint.get('analyzer_version') == version else 0
+
+def write_checkpoint(path, version, last_id, processed):
+    # Write to a temporary file first so an interrupted run never leaves a corrupt checkpoint
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'analyzer_version': version, 'last_id': last_id, 'processed': processed}, f)
+    os.replace(tmp_path, path)
+
+def backfill_entries(analyzer, chunk_size=500, processes=None, checkpoint_path=None,
+                     limit=None, progress=print):
+    """
+    Re-analyze entries whose stored scores are from an older analyzer version
+    
+    Entries are streamed in id order, analyzed a chunk at a time (across a
+    process pool when processes > 1) and written back one transaction per
+    chunk together with the matching sentiment counter changes. After each
+    chunk the last id is saved to the checkpoint file, so an interrupted run
+    resumes where it stopped; the file is removed once the backfill finishes.
+    
+    Args:
+        analyzer (SentimentAnalyzer): Analyzer whose model_version entries are brought up to
+        chunk_size (int): Entries analyzed and committed per transaction
+        processes (int): Worker processes for analyze_batch
+        checkpoint_path (str): JSON file recording progress, if any
+        limit (int): Stop after this many entries
+        progress (callable): Receives one progress line per chunk
+    
+    Returns:
+        int: Number of entries backfilled
+    """
+    version = analyzer.model_version
+    last_id = read_checkpoint(checkpoint_path, version)
+    total = db.session.query(Entry.id).filter(Entry.id > last_id, *stale_entries(version)).count()
+    if limit is not None:
+        total = min(total, limit)
+    
+    processed = 0
+    started = time.perf_counter()
+    while processed < total:
+        rows = db.session.execute(
+            select(Entry.id, Entry.content, Entry.timestamp, Entry.sentiment_label,
+                   Entry.sentiment_score, Entry.sentiment_status)
+            .where(Entry.id > last_id, *stale_entries(version))
+            .order_by(Entry.id)
+            .limit(min(chunk_size, total - processed))
+        ).all()
+        if not rows:
+            break
+        
+        results = analyzer.analyze_batch([row.content for row in rows], processes=processes)
+        
+        stats = load_stats(for_update=True)
+        mappings = []
+        for row, result in zip(rows, results):
+            mappings.append(dict(Entry.sentiment_values(result), id=row.id))
+            day = DailyMood.for_date(row.timestamp.date())
+            # Failed entries were never counted in the sentiment totals
+            if row.sentiment_status == 'complete':
+                stats.add_sentiment(row.sentiment_label, -1)
+                day.add_sentiment(row.sentiment_label, row.sentiment_score, -1)
+            stats.add_sentiment(result['sentiment_label'])
+            day.add_sentiment(result['sentiment_label'], result['compound_score'])
+        stats.touch()
+        db.session.execute(update(Entry), mappings)
+        db.session.commit()
+        
+        last_id = rows[-1].id
+        processed += len(rows)
+        if checkpoint_path:
+            write_checkpoint(checkpoint_path, version, last_id, processed)
+        
+        elapsed = time.perf_counter() - started
+        progress(f"{processed}/{total} entries backfilled "
+                 f"({processed / elapsed:.1f} entries/s, last id {last_id})")
+    
+    # Keep the checkpoint when stopping early at the limit
+    if checkpoint_path and limit is None and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return processed
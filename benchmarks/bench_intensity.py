@@ -0,0 +1,63 @@
+"""
+Micro-benchmarks for SentimentAnalyzer.analyze_emotional_intensity
+
+Compares the frozenset/C-level counting scorer against the previous
+implementation (list membership tests, per-character generator for caps,
+text.split('.') for sentences) on entries of increasing length.
+
+Usage: python benchmarks/bench_intensity.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sentiment_analyzer import SentimentAnalyzer
+
+PARAGRAPH = (
+    "Today was ABSOLUTELY exhausting! I felt very anxious in the morning. "
+    "Work was terrible and my manager was totally unreasonable. Later I went "
+    "for a walk and it was AMAZING to see the sunset. I am deeply grateful. "
+)
+
+def legacy_intensity(text):
+    """analyze_emotional_intensity as it was before the rework"""
+    words = text.split()
+    intensity_indicators = [
+        'very', 'extremely', 'incredibly', 'totally', 'completely',
+        'absolutely', 'utterly', 'deeply', 'intensely', 'overwhelming',
+        'devastating', 'amazing', 'fantastic', 'terrible', 'awful'
+    ]
+    intensity_count = sum(1 for word in words if word in intensity_indicators)
+    exclamation_count = text.count('!')
+    caps_ratio = sum(1 for c in text if c.isupper()) / max(len(text), 1)
+    intensity_score = (
+        (intensity_count / max(len(words), 1)) * 0.5 +
+        (exclamation_count / max(len(text.split('.')), 1)) * 0.3 +
+        caps_ratio * 0.2
+    )
+    return min(intensity_score, 1.0)
+
+def bench(func, runs):
+    return min(timeit.repeat(func, number=runs, repeat=5)) / runs
+
+def main():
+    analyzer = SentimentAnalyzer()
+    
+    for paragraphs in (1, 10, 100):
+        text = PARAGRAPH * paragraphs
+        cleaned = analyzer.preprocess_text(text)
+        tokens = analyzer.tokenize(cleaned)
+        runs = max(20, 5000 // paragraphs)
+        
+        legacy = bench(lambda: legacy_intensity(cleaned), runs)
+        reworked = bench(lambda: analyzer.analyze_emotional_intensity(cleaned, tokens, text), runs)
+        
+        print(f"{len(tokens):>6} words: legacy {legacy * 1e6:8.1f} us, "
+              f"reworked {reworked * 1e6:8.1f} us, speedup {legacy / reworked:.1f}x "
+              f"(score {legacy_intensity(cleaned):.3f} -> "
+              f"{analyzer.analyze_emotional_intensity(cleaned, tokens, text):.3f})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Latency of SentimentAnalyzer.analyze per scoring profile
+
+Runs each profile over a set of journal entries with caching disabled and
+reports mean and p95 latency, how often the label differs from 'full', and
+how many entries ran the TextBlob stage.
+
+Usage: python benchmarks/bench_profiles.py
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sentiment_analyzer import SentimentAnalyzer
+
+ENTRIES = [
+    "Today I felt grateful and calm after a long walk with my sister.",
+    "I'm completely overwhelmed at work and I can't sleep. Everything feels like too much!",
+    "Pretty ordinary day, a bit tired but okay. Cooked dinner and watched a movie.",
+    "Therapy was a breakthrough. I feel hopeful and proud of the progress I've made.",
+    "Lonely again tonight. I keep worrying that nothing will change.",
+    "Had an argument with a friend, then we talked it through. Mixed feelings, mostly relieved.",
+] * 4
+
+def measure(analyzer, profile, rounds=20):
+    timings = []
+    for _ in range(rounds):
+        for text in ENTRIES:
+            start = time.perf_counter()
+            analyzer.analyze(text, profile=profile)
+            timings.append(time.perf_counter() - start)
+    results = [analyzer.analyze(text, profile=profile) for text in ENTRIES]
+    labels = [result['sentiment_label'] for result in results]
+    textblob_runs = sum('textblob' in result['stages'] for result in results)
+    timings.sort()
+    return statistics.mean(timings), timings[int(len(timings) * 0.95)], labels, textblob_runs
+
+def main():
+    analyzer = SentimentAnalyzer()
+    analyzer.warm_up()
+    
+    baseline_labels = None
+    for profile in ('full', 'fast', 'cascade'):
+        mean, p95, labels, textblob_runs = measure(analyzer, profile)
+        if baseline_labels is None:
+            baseline_labels = labels
+        changed = sum(a != b for a, b in zip(labels, baseline_labels))
+        print(f"{profile:>7}: mean {mean * 1e6:8.1f} us, p95 {p95 * 1e6:8.1f} us, "
+              f"labels differing from full: {changed}/{len(labels)}, "
+              f"textblob ran: {textblob_runs}/{len(labels)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Streak computation over large journals
+
+Fills an in-memory database with journals of 10k and 100k entries (several
+per day, with occasional gaps) and times the streak code the app runs:
+entry_dates (distinct dates from the idx_entries_date index) and
+streaks_from_dates, which rebuild_stats uses, and record_entry for a
+back-dated entry, which recomputes the streaks from all entry dates. The
+dashboard itself reads UserStats.streak_days(), which is O(1). The previous
+implementation, which deduplicated dates with list membership checks, is
+timed on the smaller journal only since it is quadratic.
+
+Usage: python benchmarks/bench_streaks.py
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
+
+from app import app
+from models import db, Entry
+from analytics import entry_dates, rebuild_stats, record_entry, streaks_from_dates
+
+def legacy_streak(entries):
+    """The streak calculation this engine replaced, kept for comparison"""
+    sorted_entries = sorted(entries, key=lambda x: x.timestamp, reverse=True)
+    dates = []
+    for entry in sorted_entries:
+        date = entry.timestamp.date()
+        if date not in dates:
+            dates.append(date)
+    
+    today = datetime.now().date()
+    if dates[0] == today:
+        streak, current_date = 1, today - timedelta(days=1)
+    elif dates[0] == today - timedelta(days=1):
+        streak, current_date = 1, today - timedelta(days=2)
+    else:
+        return 0
+    for date in dates[1:]:
+        if date != current_date:
+            break
+        streak += 1
+        current_date -= timedelta(days=1)
+    return streak
+
+def fill(count):
+    db.session.query(Entry).delete()
+    rng = random.Random(42)
+    now = datetime.now()
+    rows = []
+    timestamp = now
+    for _ in range(count):
+        rows.append({'mood_rating': rng.randint(1, 5), 'content': 'entry', 'timestamp': timestamp})
+        # Three entries a day on average, with a missed day now and then
+        timestamp -= timedelta(hours=rng.choice((4, 8, 12, 52)))
+    db.session.execute(db.insert(Entry), rows)
+    db.session.commit()
+
+def timed(func, rounds=5):
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        value = func()
+        best = min(best, time.perf_counter() - start)
+    return best, value
+
+def backdated_entry():
+    """Add an entry a year in the past, which forces a streak recompute, then roll it back"""
+    entry = Entry(mood_rating=3, content='entry', timestamp=datetime.now() - timedelta(days=365))
+    record_entry(entry)
+    db.session.add(entry)
+    db.session.flush()
+    db.session.rollback()
+
+def main():
+    with app.app_context():
+        db.create_all()
+        for count in (10_000, 100_000):
+            fill(count)
+            rebuild_stats()
+            db.session.commit()
+            
+            seconds, dates = timed(entry_dates)
+            print(f"{count:>7} entries: entry_dates {seconds * 1e3:8.2f} ms ({len(dates)} dates)")
+            
+            seconds, streaks = timed(lambda: streaks_from_dates(dates))
+            print(f"{count:>7} entries: streaks_from_dates {seconds * 1e3:8.2f} ms {streaks}")
+            
+            seconds, _ = timed(backdated_entry)
+            print(f"{count:>7} entries: back-dated record_entry {seconds * 1e3:8.2f} ms")
+            
+            if count <= 10_000:
+                entries = Entry.query.all()
+                seconds, streak = timed(lambda: legacy_streak(entries), rounds=1)
+                print(f"{count:>7} entries: legacy calculate_journal_streak {seconds * 1e3:8.2f} ms "
+                      f"(streak {streak})")
+
+if __name__ == '__main__':
+    main()
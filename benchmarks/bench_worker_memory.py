@@ -0,0 +1,83 @@
+"""
+Memory-per-worker benchmark for preloaded vs per-worker sentiment analyzers
+
+Forks worker processes the way gunicorn does, once with the analyzer built
+and warmed up in the parent before fork (gunicorn_conf.py's preload mode) and
+once with each worker building its own. Each worker analyzes a few entries and
+reports its private (unshared) and proportional (PSS) memory. Linux only.
+
+Usage: python benchmarks/bench_worker_memory.py [workers]
+"""
+import gc
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sentiment_analyzer import SentimentAnalyzer
+
+SAMPLES = [
+    "Today I felt grateful and calm after a long walk.",
+    "I'm completely overwhelmed and burned out at work.",
+    "Pretty ordinary day, a bit tired but okay.",
+]
+
+def memory_kb():
+    """Private and proportional set size of this process, from /proc/self/smaps_rollup"""
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        'private': values['Private_Clean'] + values['Private_Dirty'],
+        'pss': values['Pss']
+    }
+
+def run_worker(analyzer, write_fd):
+    gc.enable()
+    if analyzer is None:
+        analyzer = SentimentAnalyzer()
+        analyzer.warm_up()
+    for text in SAMPLES:
+        analyzer.analyze(text)
+    gc.collect()
+    os.write(write_fd, json.dumps(memory_kb()).encode())
+    os._exit(0)
+
+def measure(workers, preload):
+    analyzer = None
+    if preload:
+        analyzer = SentimentAnalyzer()
+        analyzer.warm_up()
+        gc.freeze()
+    
+    reports = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            run_worker(analyzer, write_fd)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as pipe:
+            reports.append(json.loads(pipe.read()))
+        os.waitpid(pid, 0)
+    
+    gc.unfreeze()
+    return {key: sum(r[key] for r in reports) / len(reports) for key in ('private', 'pss')}
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    gc.disable()
+    
+    for preload in (False, True):
+        result = measure(workers, preload)
+        label = 'preloaded in master' if preload else 'built per worker   '
+        print(f"{label}: {result['private'] / 1024:7.1f} MB private, "
+              f"{result['pss'] / 1024:7.1f} MB PSS per worker ({workers} workers)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache with optional expiry and hit/miss counters
+    
+    An optional persistent store (see SQLiteStore) acts as a second tier: local
+    misses fall through to it, and every write goes to both tiers.
+    """
+    
+    def __init__(self, max_size=1024, ttl=None, store=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.store = store
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                value, expires_at = item
+                if expires_at is None or expires_at > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+        
+        if self.store is not None:
+            value = self.store.get(key)
+            if value is not None:
+                self._set_local(key, value)
+                with self._lock:
+                    self.store_hits += 1
+                return value
+        
+        with self._lock:
+            self.misses += 1
+        return None
+    
+    def set(self, key, value):
+        self._set_local(key, value)
+        if self.store is not None:
+            self.store.set(key, value)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+        if self.store is not None:
+            self.store.clear()
+    
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.store_hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'store_hits': self.store_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round((self.hits + self.store_hits) / lookups, 3) if lookups else 0.0
+            }
+    
+    def _set_local(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+class SQLiteStore:
+    """
+    Persistent key/value tier backed by a SQLite file
+    
+    Values are stored as JSON, so they survive restarts and can be shared by
+    several worker processes on the same host.
+    """
+    
+    def __init__(self, path, table='cache', ttl=None, max_rows=100000):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._writes = 0
+    
+    def get(self, key):
+        with self._lock:
+            row = self._connection().execute(
+                f'SELECT value, expires_at FROM {self.table} WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return json.loads(value)
+    
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                f'INSERT OR REPLACE INTO {self.table} (key, value, expires_at, stored_at) '
+                f'VALUES (?, ?, ?, ?)',
+                (key, json.dumps(value), expires_at, time.time())
+            )
+            self._writes += 1
+            if self._writes % 1000 == 0:
+                self._prune(conn)
+            conn.commit()
+    
+    def clear(self):
+        with self._lock:
+            conn = self._connection()
+            conn.execute(f'DELETE FROM {self.table}')
+            conn.commit()
+    
+    def _prune(self, conn):
+        """Drop expired rows and keep only the most recently stored max_rows"""
+        conn.execute(f'DELETE FROM {self.table} WHERE expires_at <= ?', (time.time(),))
+        conn.execute(
+            f'DELETE FROM {self.table} WHERE key IN ('
+            f'SELECT key FROM {self.table} ORDER BY stored_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_rows,)
+        )
+    
+    def _connection(self):
+        # SQLite connections must not be shared across fork
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.table} ('
+                f'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, stored_at REAL)'
+            )
+            self._pid = os.getpid()
+        return self._conn
@@ -12,6 +12,40 @@ class Config:
     # App specific settings
     MAX_ENTRIES_PER_DAY = 5
     INSIGHTS_UPDATE_INTERVAL = 24  # hours
+    ENTRIES_PAGE_SIZE = 100
+    ENTRIES_MAX_PAGE_SIZE = 500
+
+    # Score new entries on a background thread pool instead of in the request
+    SENTIMENT_ASYNC = os.environ.get('SENTIMENT_ASYNC', '').lower() in ('1', 'true', 'yes')
+    SENTIMENT_WORKERS = int(os.environ.get('SENTIMENT_WORKERS', 2))
+
+    # Bulk imports; processes > 1 fans analysis out across a process pool
+    BULK_MAX_ENTRIES = 1000
+    SENTIMENT_BATCH_PROCESSES = int(os.environ.get('SENTIMENT_BATCH_PROCESSES', 0))
+
+    # Memoize analysis results by content hash; set a path to persist them across restarts
+    SENTIMENT_CACHE_SIZE = int(os.environ.get('SENTIMENT_CACHE_SIZE', 2048))
+    SENTIMENT_CACHE_TTL = int(os.environ.get('SENTIMENT_CACHE_TTL', 0)) or None  # seconds
+    SENTIMENT_CACHE_PATH = os.environ.get('SENTIMENT_CACHE_PATH')
+
+    # Memoize /api/analytics per data version and day; set a path to share it across workers
+    ANALYTICS_CACHE_SIZE = int(os.environ.get('ANALYTICS_CACHE_SIZE', 16))
+    ANALYTICS_CACHE_PATH = os.environ.get('ANALYTICS_CACHE_PATH')
+    
+    # NLTK resources: vendored data directory, no-network mode, and eager loading at startup
+    NLTK_DATA_PATH = os.environ.get('NLTK_DATA_PATH')
+    NLTK_OFFLINE = os.environ.get('NLTK_OFFLINE', '').lower() in ('1', 'true', 'yes')
+    SENTIMENT_WARMUP = os.environ.get('SENTIMENT_WARMUP', '').lower() in ('1', 'true', 'yes')
+
+    # Scoring stages: weights in the combined score, and the default profile
+    # ('full' runs every stage, 'fast' skips TextBlob, 'cascade' runs TextBlob only
+    # when the cheaper stages are less confident than SENTIMENT_CASCADE_THRESHOLD)
+    SENTIMENT_WEIGHTS = {'vader': 0.35, 'textblob': 0.25, 'psychology': 0.30, 'intensity': 0.10}
+    SENTIMENT_PROFILE = os.environ.get('SENTIMENT_PROFILE', 'full')
+    SENTIMENT_CASCADE_THRESHOLD = float(os.environ.get('SENTIMENT_CASCADE_THRESHOLD', 0.8))
+    # Combined score magnitude needed for a positive/negative label; after changing
+    # it or the weights, run `flask --app app rescore` to update stored entries
+    SENTIMENT_LABEL_THRESHOLD = float(os.environ.get('SENTIMENT_LABEL_THRESHOLD', 0.15))
 
 class DevelopmentConfig(Config):
     DEBUG = True
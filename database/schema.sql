@@ -6,6 +6,18 @@ CREATE TABLE IF NOT EXISTS entries (
     content TEXT NOT NULL,
     sentiment_score REAL DEFAULT 0.0,
     sentiment_label VARCHAR(20),
+    sentiment_status VARCHAR(10) DEFAULT 'complete',
+    sentiment_confidence REAL,
+    vader_positive REAL,
+    vader_neutral REAL,
+    vader_negative REAL,
+    vader_compound REAL,
+    textblob_polarity REAL,
+    textblob_subjectivity REAL,
+    psychology_score REAL,
+    emotional_intensity REAL,
+    word_count INTEGER,
+    analyzer_version VARCHAR(40),
     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
@@ -16,10 +28,30 @@ CREATE TABLE IF NOT EXISTS user_stats (
     current_streak INTEGER DEFAULT 0,
     longest_streak INTEGER DEFAULT 0,
     avg_mood REAL DEFAULT 0.0,
+    mood_sum INTEGER DEFAULT 0,
+    mood_sum_sq INTEGER DEFAULT 0,
+    positive_entries INTEGER DEFAULT 0,
+    positive_sentiment INTEGER DEFAULT 0,
+    neutral_sentiment INTEGER DEFAULT 0,
+    negative_sentiment INTEGER DEFAULT 0,
+    last_entry_date DATE,
+    data_version INTEGER DEFAULT 0,
     last_updated DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
+CREATE TABLE IF NOT EXISTS daily_mood (
+    date DATE PRIMARY KEY,
+    entry_count INTEGER DEFAULT 0,
+    mood_sum INTEGER DEFAULT 0,
+    mood_sum_sq INTEGER DEFAULT 0,
+    positive_count INTEGER DEFAULT 0,
+    neutral_count INTEGER DEFAULT 0,
+    negative_count INTEGER DEFAULT 0,
+    sentiment_sum REAL DEFAULT 0.0
+);
+
 -- Indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_entries_timestamp ON entries(timestamp);
+CREATE INDEX IF NOT EXISTS idx_entries_date ON entries(date(timestamp));
 CREATE INDEX IF NOT EXISTS idx_entries_mood_rating ON entries(mood_rating);
 CREATE INDEX IF NOT EXISTS idx_entries_sentiment ON entries(sentiment_label);
@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+from datetime import datetime
+from models import db, Entry
+
+# Content type of each export format
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+    'csv': 'text/csv'
+}
+
+def entry_rows(fields, batch_size=500):
+    """Stream entries oldest first as plain dicts, fetching batch_size rows at a time"""
+    query = (db.session.query(*(getattr(Entry, name) for name in fields))
+             .order_by(Entry.timestamp, Entry.id)
+             .yield_per(batch_size))
+    for row in query:
+        yield {name: value.isoformat() if isinstance(value, datetime) else value
+               for name, value in zip(fields, row)}
+
+def batched(lines, size=500):
+    """Join lines into larger chunks so the response isn't written row by row"""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row) + '\n'
+
+def json_array_lines(rows):
+    yield '['
+    separator = ''
+    for row in rows:
+        yield separator + json.dumps(row)
+        separator = ','
+    yield ']\n'
+
+def csv_lines(rows, fields):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for row in rows:
+        writer.writerow(row[name] for name in fields)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only, when there are no entries
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def export_chunks(export_format, fields, batch_size=500):
+    """
+    Encode every entry in one of EXPORT_FORMATS as a stream of text chunks
+    
+    Memory use is bounded by batch_size regardless of the number of entries.
+    """
+    rows = entry_rows(fields, batch_size)
+    if export_format == 'ndjson':
+        lines = ndjson_lines(rows)
+    elif export_format == 'json':
+        lines = json_array_lines(rows)
+    else:
+        lines = csv_lines(rows, fields)
+    return batched(lines, batch_size)
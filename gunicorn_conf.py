@@ -0,0 +1,68 @@
+"""
+Gunicorn configuration for MoodMate
+
+Usage: gunicorn -c gunicorn_conf.py app:app
+
+The app is imported once in the master before forking (preload_app) and the
+sentiment analyzer is warmed up there, so the VADER and TextBlob lexicons are
+built once and shared copy-on-write by every worker instead of being rebuilt
+in each of them.
+"""
+import gc
+import multiprocessing
+import os
+
+# Build the analyzer's lexicons at import time, i.e. in the master
+os.environ.setdefault('SENTIMENT_WARMUP', '1')
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+preload_app = True
+
+# Collections in the master would free objects and leave holes in pages that
+# workers then share; the master only supervises, so skip GC there entirely
+gc.disable()
+
+def when_ready(server):
+    # Create or upgrade the schema once, in the master, before any worker starts
+    from app import app, upgrade_schema
+    with app.app_context():
+        for change in upgrade_schema():
+            server.log.info("Database upgrade: %s", change)
+
+# Entries queued in a worker that exited stay 'pending'. Set in the master at
+# startup, on reload and whenever a worker exits, so exactly one of the workers
+# forked next requeues them rather than all of them
+requeue_next = True
+
+def on_reload(server):
+    global requeue_next
+    requeue_next = True
+
+def child_exit(server, worker):
+    global requeue_next
+    requeue_next = True
+
+def pre_fork(server, worker):
+    global requeue_next
+    worker.requeue_pending = requeue_next
+    requeue_next = False
+    
+    # Move everything allocated so far (app, lexicons) into the permanent
+    # generation so the workers' GC never writes to those objects' headers
+    gc.freeze()
+
+def post_fork(server, worker):
+    gc.enable()
+    
+    # Database connections must not be shared across processes
+    from app import app, db, sentiment_worker
+    with app.app_context():
+        db.engine.dispose()
+
+    # Entries still being scored by an old worker may be analyzed twice, but the
+    # worker's conditional update counts each one only once
+    if app.config['SENTIMENT_ASYNC'] and worker.requeue_pending:
+        requeued = sentiment_worker.requeue_pending()
+        if requeued:
+            server.log.info("Requeued %d entries pending sentiment analysis", requeued)
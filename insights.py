@@ -0,0 +1,89 @@
+from analytics import recent_activity
+
+def stats_summary(stats):
+    """Summarize the journal for insight generation from the running aggregates, without scanning entries"""
+    total_entries = stats.total_entries
+    recent_avg, recent_week_entries = recent_activity()
+    return {
+        'total_entries': total_entries,
+        'avg_mood': stats.mood_sum / total_entries if total_entries else 0.0,
+        'mood_std': stats.mood_std(),
+        'recent_avg': recent_avg,
+        'recent_week_entries': recent_week_entries,
+        'positive_sentiment': stats.positive_sentiment,
+        'negative_sentiment': stats.negative_sentiment
+    }
+
+def generate_psychology_insights(summary):
+    """
+    Generate CBT-inspired insights from a journal summary
+    
+    Args:
+        summary (dict): As returned by stats_summary
+    """
+    insights = []
+    total_entries = summary['total_entries']
+    
+    if total_entries < 3:
+        return [{
+            'title': 'Building Self-Awareness 🧠',
+            'content': f"You've made {total_entries} journal entries! Each entry contributes to better self-understanding. Regular journaling is a cornerstone of emotional wellness and cognitive behavioral therapy (CBT)."
+        }]
+    
+    avg_mood = summary['avg_mood']
+    recent_avg = summary['recent_avg']
+    recent_week_entries = summary['recent_week_entries']
+    
+    # Mood trend analysis
+    if recent_avg > avg_mood + 0.5:
+        insights.append({
+            'title': 'Positive Momentum Detected 📈',
+            'content': 'Your recent entries show an upward trend in mood! This suggests that recent changes in your life, thoughts, or behaviors are having a positive impact. Consider what factors might be contributing to this improvement and how you can maintain them.'
+        })
+    elif recent_avg < avg_mood - 0.5:
+        insights.append({
+            'title': 'CBT Reflection Opportunity 🤔',
+            'content': 'Your recent entries show some challenging periods. Remember that temporary setbacks are normal and part of the human experience. Try identifying any negative thought patterns and practice reframing them with evidence-based thinking.'
+        })
+    
+    # Sentiment analysis insights
+    positive_sentiment = summary['positive_sentiment']
+    negative_sentiment = summary['negative_sentiment']
+    
+    if positive_sentiment > negative_sentiment * 1.5:
+        insights.append({
+            'title': 'Positive Language Patterns 😊',
+            'content': 'Your journal entries show predominantly positive language patterns. This indicates good emotional regulation and optimistic thinking patterns, which are protective factors for mental health according to positive psychology research.'
+        })
+    elif negative_sentiment > positive_sentiment:
+        insights.append({
+            'title': 'Cognitive Reframing Practice 🔄',
+            'content': 'Your entries show some negative language patterns. Try the CBT technique of examining one negative thought per day: What evidence supports this thought? What evidence challenges it? What would you tell a friend in this situation?'
+        })
+    
+    # Consistency insight
+    if total_entries >= 7:
+        if recent_week_entries >= 5:
+            insights.append({
+                'title': 'Excellent Consistency! 🌟',
+                'content': 'You\'ve been journaling regularly this week! Consistent self-reflection is a key component of emotional wellness and is strongly supported by psychological research on habit formation and mindfulness.'
+            })
+    
+    # Mood variability insight
+    if total_entries >= 10:
+        mood_std = summary['mood_std']
+        
+        if mood_std > 1.2:
+            insights.append({
+                'title': 'Emotional Range Awareness 📊',
+                'content': 'Your mood shows natural variation over time, which is completely normal. If you notice significant swings, consider tracking potential triggers like sleep quality, stress levels, or major life events to identify patterns.'
+            })
+    
+    # Default insight if no specific patterns detected
+    if not insights:
+        insights.append({
+            'title': 'Steady Progress 🎯',
+            'content': f'You\'ve maintained an average mood of {avg_mood:.1f}/5 across {total_entries} entries. This consistent self-monitoring is building emotional intelligence and self-awareness - key components of psychological well-being.'
+        })
+    
+    return insights
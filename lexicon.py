@@ -0,0 +1,157 @@
+import json
+import os
+from array import array
+
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                    'data', 'psychology_lexicon.json')
+
+# Kinds of lexicon terms
+VALENCE = 0
+MODIFIER = 1
+
+# Key marking the end of a term in the phrase trie (tokens are never empty)
+TERM_END = ''
+
+class Lexicon:
+    """
+    Immutable psychology lexicon merging valence words and intensity modifiers
+    
+    Every term maps to a slot; scores and kinds live in flat arrays indexed by
+    slot, so a token needs a single dict lookup and the scores don't exist as
+    individual float objects. That keeps large clinical term lists compact and
+    leaves the arrays untouched (copy-on-write friendly) when workers read them.
+    """
+    __slots__ = ('version', '_slots', '_scores', '_kinds', '_phrase_trie')
+    
+    def __init__(self, version, valence, modifiers):
+        """
+        Args:
+            version (str): Version of the lexicon data
+            valence (dict): Term -> sentiment score
+            modifiers (dict): Term -> intensity multiplier for the following term
+        """
+        slots = {}
+        scores = array('d')
+        kinds = bytearray()
+        for kind, terms in ((VALENCE, valence), (MODIFIER, modifiers)):
+            for term, score in terms.items():
+                term = ' '.join(term.lower().split())
+                if term in slots:
+                    raise ValueError(f"Duplicate lexicon term: {term!r}")
+                slots[term] = len(scores)
+                scores.append(score)
+                kinds.append(kind)
+        
+        self.__setstate__((str(version), slots, scores, bytes(kinds)))
+    
+    @classmethod
+    def load(cls, path=DEFAULT_LEXICON_PATH):
+        """Load a lexicon from a versioned JSON data file"""
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['version'], data.get('valence', {}), data.get('modifiers', {}))
+    
+    def lookup(self, term):
+        """Return the slot of term, or -1 if it is not in the lexicon"""
+        return self._slots.get(term, -1)
+    
+    def score(self, slot):
+        return self._scores[slot]
+    
+    def kind(self, slot):
+        return self._kinds[slot]
+    
+    @property
+    def scores(self):
+        """Scores indexed by slot"""
+        return self._scores
+    
+    @property
+    def kinds(self):
+        """Term kinds (VALENCE or MODIFIER) indexed by slot"""
+        return self._kinds
+    
+    def get(self, term):
+        """Return (kind, score) for term, or None"""
+        slot = self._slots.get(term, -1)
+        if slot < 0:
+            return None
+        return self._kinds[slot], self._scores[slot]
+    
+    def terms(self, kind=None):
+        """Iterate over (term, score) pairs, optionally restricted to one kind"""
+        for term, slot in self._slots.items():
+            if kind is None or self._kinds[slot] == kind:
+                yield term, self._scores[slot]
+    
+    @property
+    def phrase_trie(self):
+        """
+        Token trie of the multi-word terms with their slots as payloads, built on first use
+        
+        Single words are resolved with lookup(), so only the (few) phrases get
+        trie nodes.
+        """
+        if self._phrase_trie is None:
+            self._phrase_trie = build_phrase_trie(
+                (term, slot) for term, slot in self._slots.items() if ' ' in term
+            )
+        return self._phrase_trie
+    
+    def __len__(self):
+        return len(self._slots)
+    
+    def __contains__(self, term):
+        return term in self._slots
+    
+    def __setattr__(self, name, value):
+        # Only the lazily built trie may be assigned after construction
+        if name != '_phrase_trie':
+            raise AttributeError('Lexicon is immutable')
+        object.__setattr__(self, name, value)
+    
+    def __getstate__(self):
+        return self.version, self._slots, self._scores, self._kinds
+    
+    def __setstate__(self, state):
+        version, slots, scores, kinds = state
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, '_slots', slots)
+        object.__setattr__(self, '_scores', scores)
+        object.__setattr__(self, '_kinds', kinds)
+        object.__setattr__(self, '_phrase_trie', None)
+
+def build_phrase_trie(terms):
+    """
+    Build a token trie from (phrase, payload) pairs
+    
+    Each node maps the next word to a child node; TERM_END holds the payload
+    of a phrase that ends at that node.
+    """
+    trie = {}
+    for phrase, payload in terms:
+        node = trie
+        for word in phrase.split():
+            node = node.setdefault(word, {})
+        node[TERM_END] = payload
+    return trie
+
+def match_phrase(trie, words, start):
+    """
+    Find the longest trie phrase starting at words[start]
+    
+    Returns:
+        tuple: (payload, number of words matched) or None
+    """
+    node = trie
+    match = None
+    for position in range(start, len(words)):
+        node = node.get(words[position])
+        if node is None:
+            break
+        if TERM_END in node:
+            match = (node[TERM_END], position - start + 1)
+    return match
+
+# Shared by every analyzer in the process (and across forked workers)
+PSYCHOLOGY_LEXICON = Lexicon.load()
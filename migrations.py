@@ -0,0 +1,63 @@
+from sqlalchemy import inspect, literal
+from models import db
+from analytics import rebuild_stats
+
+def column_ddl(column, dialect):
+    """Column definition for ALTER TABLE ... ADD COLUMN, with its scalar default if any"""
+    ddl = f'{column.name} {column.type.compile(dialect=dialect)}'
+    if column.default is not None and column.default.is_scalar:
+        # Existing rows take the default too (e.g. old entries are 'complete')
+        default = literal(column.default.arg).compile(dialect=dialect, compile_kwargs={'literal_binds': True})
+        ddl += f' DEFAULT {default}'
+    return ddl
+
+def index_names(connection, inspector, table_name):
+    if connection.dialect.name == 'sqlite':
+        # SQLite reflection skips expression indexes such as idx_entries_date
+        return set(connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?", (table_name,)
+        ).scalars())
+    return {index['name'] for index in inspector.get_indexes(table_name)}
+
+def upgrade_schema():
+    """
+    Bring an existing database up to date with the models
+    
+    create_all() only creates missing tables, so columns added to existing
+    tables are added with ALTER TABLE ... ADD COLUMN and missing indexes are
+    created. If anything changed, the running aggregates are rebuilt, since
+    new aggregate columns and tables start out empty. Safe to run on every
+    startup: an up-to-date database is left untouched.
+    
+    Returns:
+        list: Descriptions of the changes made
+    """
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    changes = []
+    
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                table.create(connection)
+                changes.append(f'created table {table.name}')
+                continue
+            
+            columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in columns:
+                    connection.exec_driver_sql(
+                        f'ALTER TABLE {table.name} ADD COLUMN {column_ddl(column, connection.dialect)}'
+                    )
+                    changes.append(f'added column {table.name}.{column.name}')
+            
+            indexes = index_names(connection, inspector, table.name)
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(connection)
+                    changes.append(f'created index {index.name}')
+    
+    if changes and existing_tables:
+        rebuild_stats()
+        db.session.commit()
+    return changes
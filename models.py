@@ -1,39 +1,289 @@
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import load_only
+from datetime import datetime, timedelta
+import base64
 
 db = SQLAlchemy()
 
+def encode_cursor(timestamp, entry_id):
+    """Encode a (timestamp, id) keyset position as an opaque cursor string"""
+    raw = f"{timestamp.isoformat()}|{entry_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor, raising ValueError if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, entry_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(timestamp), int(entry_id)
+    except (ValueError, UnicodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
 class Entry(db.Model):
     __tablename__ = 'entries'
+    __table_args__ = (
+        # On SQLite the rowid (id) is implicitly appended to secondary indexes,
+        # so this index also serves (timestamp, id) keyset pagination
+        db.Index('idx_entries_timestamp', 'timestamp'),
+        # Distinct entry dates (streaks) are read straight from this expression index
+        db.Index('idx_entries_date', db.func.date(db.text('timestamp'))),
+        db.Index('idx_entries_mood_rating', 'mood_rating'),
+        db.Index('idx_entries_sentiment', 'sentiment_label'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     mood_rating = db.Column(db.Integer, nullable=False)
     content = db.Column(db.Text, nullable=False)
     sentiment_score = db.Column(db.Float, default=0.0)
     sentiment_label = db.Column(db.String(20))
+    # 'pending' while queued for background analysis, then 'complete' or 'failed'
+    sentiment_status = db.Column(db.String(10), default='complete')
+    # Component scores, kept so summaries, analytics and re-weighting can run
+    # without re-analyzing the text; NULL where a scoring stage was skipped
+    sentiment_confidence = db.Column(db.Float)
+    vader_positive = db.Column(db.Float)
+    vader_neutral = db.Column(db.Float)
+    vader_negative = db.Column(db.Float)
+    vader_compound = db.Column(db.Float)
+    textblob_polarity = db.Column(db.Float)
+    textblob_subjectivity = db.Column(db.Float)
+    psychology_score = db.Column(db.Float)
+    emotional_intensity = db.Column(db.Float)
+    word_count = db.Column(db.Integer)
+    # SentimentAnalyzer.model_version that produced the scores; see backfill.py
+    analyzer_version = db.Column(db.String(40))
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    def to_dict(self):
+    # Fields exposed through the API, in serialization order
+    FIELDS = ('id', 'mood_rating', 'content', 'sentiment_score',
+              'sentiment_label', 'sentiment_status', 'timestamp', 'created_at')
+    # Stored component scores, only returned when requested
+    SCORE_FIELDS = ('sentiment_confidence', 'vader_positive', 'vader_neutral', 'vader_negative',
+                    'vader_compound', 'textblob_polarity', 'textblob_subjectivity',
+                    'psychology_score', 'emotional_intensity', 'word_count', 'analyzer_version')
+    
+    @classmethod
+    def page(cls, limit, cursor=None, fields=None):
+        """
+        Fetch one page of entries, newest first, using keyset pagination
+        
+        Args:
+            limit (int): Maximum number of entries to return
+            cursor (str): Cursor returned with the previous page, if any
+            fields (tuple): Subset of FIELDS to load; defaults to all
+        
+        Returns:
+            tuple: (list of entries, cursor for the next page or None)
+        """
+        query = cls.query.order_by(cls.timestamp.desc(), cls.id.desc())
+        
+        if fields:
+            # id and timestamp are always needed to build the next cursor
+            columns = {'id', 'timestamp', *fields}
+            query = query.options(load_only(*(getattr(cls, name) for name in columns)))
+        
+        if cursor:
+            timestamp, entry_id = decode_cursor(cursor)
+            query = query.filter(or_(
+                cls.timestamp < timestamp,
+                and_(cls.timestamp == timestamp, cls.id < entry_id)
+            ))
+        
+        # Fetch one extra row to know whether another page exists
+        entries = query.limit(limit + 1).all()
+        next_cursor = None
+        if len(entries) > limit:
+            entries = entries[:limit]
+            last = entries[-1]
+            next_cursor = encode_cursor(last.timestamp, last.id)
+        
+        return entries, next_cursor
+    
+    @staticmethod
+    def sentiment_values(result):
+        """Map the output of SentimentAnalyzer.analyze onto Entry columns"""
+        vader_scores = result['vader_scores'] or {}
         return {
-            'id': self.id,
-            'mood_rating': self.mood_rating,
-            'content': self.content,
-            'sentiment_score': self.sentiment_score,
+            'sentiment_score': result['compound_score'],
+            'sentiment_label': result['sentiment_label'],
+            'sentiment_confidence': result['confidence'],
+            'vader_positive': vader_scores.get('pos'),
+            'vader_neutral': vader_scores.get('neu'),
+            'vader_negative': vader_scores.get('neg'),
+            'vader_compound': vader_scores.get('compound'),
+            'textblob_polarity': result['textblob_polarity'],
+            'textblob_subjectivity': result['textblob_subjectivity'],
+            'psychology_score': result['psychology_score'],
+            'emotional_intensity': result['emotional_intensity'],
+            'word_count': result['word_count'],
+            'analyzer_version': result['analyzer_version'],
+            'sentiment_status': 'complete'
+        }
+    
+    def apply_sentiment(self, result):
+        """Store the output of SentimentAnalyzer.analyze on this entry"""
+        for name, value in self.sentiment_values(result).items():
+            setattr(self, name, value)
+    
+    def sentiment_result(self):
+        """Rebuild an analysis result from the stored scores, in SentimentAnalyzer.analyze's shape"""
+        vader_scores = None
+        if self.vader_compound is not None:
+            vader_scores = {
+                'compound': self.vader_compound,
+                'pos': self.vader_positive,
+                'neu': self.vader_neutral,
+                'neg': self.vader_negative
+            }
+        return {
+            'compound_score': self.sentiment_score,
             'sentiment_label': self.sentiment_label,
-            'timestamp': self.timestamp.isoformat(),
-            'created_at': self.created_at.isoformat()
+            'confidence': self.sentiment_confidence,
+            'vader_scores': vader_scores,
+            'textblob_polarity': self.textblob_polarity,
+            'textblob_subjectivity': self.textblob_subjectivity,
+            'psychology_score': self.psychology_score,
+            'emotional_intensity': self.emotional_intensity,
+            'word_count': self.word_count,
+            'analyzer_version': self.analyzer_version
         }
     
+    def to_dict(self, fields=None):
+        data = {}
+        for name in fields or self.FIELDS:
+            value = getattr(self, name)
+            data[name] = value.isoformat() if isinstance(value, datetime) else value
+        return data
+    
     def __repr__(self):
         return f'<Entry {self.id}: Mood {self.mood_rating}>'
 
 class UserStats(db.Model):
+    """
+    Running analytics aggregates, maintained on every write so the
+    dashboard never has to scan the entries table
+    """
     __tablename__ = 'user_stats'
     
+    # MoodMate is single-user, so all aggregates live in one row
+    SINGLETON_ID = 1
+    
     id = db.Column(db.Integer, primary_key=True)
     total_entries = db.Column(db.Integer, default=0)
     current_streak = db.Column(db.Integer, default=0)
     longest_streak = db.Column(db.Integer, default=0)
     avg_mood = db.Column(db.Float, default=0.0)
+    mood_sum = db.Column(db.Integer, default=0)
+    mood_sum_sq = db.Column(db.Integer, default=0)
+    positive_entries = db.Column(db.Integer, default=0)
+    positive_sentiment = db.Column(db.Integer, default=0)
+    neutral_sentiment = db.Column(db.Integer, default=0)
+    negative_sentiment = db.Column(db.Integer, default=0)
+    last_entry_date = db.Column(db.Date)
+    # Bumped on every write to entries; drives ETag/Last-Modified on the read endpoints
+    data_version = db.Column(db.Integer, default=0)
     last_updated = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def apply_aggregates(self, aggregates):
+        """Overwrite the running totals with freshly computed aggregates"""
+        self.total_entries = aggregates['count']
+        self.mood_sum = aggregates['mood_sum']
+        self.mood_sum_sq = aggregates['mood_sum_sq']
+        self.avg_mood = aggregates['avg_mood']
+        self.positive_entries = aggregates['positive_entries']
+        self.positive_sentiment = aggregates['label_counts']['positive']
+        self.neutral_sentiment = aggregates['label_counts']['neutral']
+        self.negative_sentiment = aggregates['label_counts']['negative']
+    
+    def touch(self):
+        """Record that the underlying data changed"""
+        self.data_version = (self.data_version or 0) + 1
+        self.last_updated = datetime.utcnow()
+    
+    def add_mood(self, mood):
+        self.total_entries += 1
+        self.mood_sum += mood
+        self.mood_sum_sq += mood * mood
+        if mood >= 4:
+            self.positive_entries += 1
+        self.avg_mood = self.mood_sum / self.total_entries
+    
+    def add_sentiment(self, label, delta=1):
+        column = f'{label}_sentiment'
+        if label and hasattr(self, column):
+            setattr(self, column, getattr(self, column) + delta)
+    
+    def add_entry_date(self, date):
+        """Extend the streaks with an entry made on the given date"""
+        if self.last_entry_date is None or date > self.last_entry_date:
+            if self.last_entry_date == date - timedelta(days=1):
+                self.current_streak += 1
+            else:
+                self.current_streak = 1
+            self.last_entry_date = date
+            self.longest_streak = max(self.longest_streak, self.current_streak)
+            return True
+        # Same-day entries don't change streaks; back-dated ones need a rebuild
+        return date == self.last_entry_date
+    
+    def set_streaks(self, current_streak, longest_streak, last_entry_date):
+        self.current_streak = current_streak
+        self.longest_streak = longest_streak
+        self.last_entry_date = last_entry_date
+    
+    def streak_days(self, today=None):
+        """Current journaling streak, which lapses if neither today nor yesterday (UTC, like entry timestamps) has an entry"""
+        today = today or datetime.utcnow().date()
+        if self.last_entry_date in (today, today - timedelta(days=1)):
+            return self.current_streak
+        return 0
+    
+    def mood_std(self):
+        if not self.total_entries:
+            return 0.0
+        mean = self.mood_sum / self.total_entries
+        variance = self.mood_sum_sq / self.total_entries - mean ** 2
+        return max(variance, 0.0) ** 0.5
+
+class DailyMood(db.Model):
+    """
+    Per-day rollup of entries, maintained alongside UserStats so time-series
+    charts read one row per day instead of every entry
+    """
+    __tablename__ = 'daily_mood'
+    
+    date = db.Column(db.Date, primary_key=True)
+    entry_count = db.Column(db.Integer, default=0)
+    mood_sum = db.Column(db.Integer, default=0)
+    mood_sum_sq = db.Column(db.Integer, default=0)
+    positive_count = db.Column(db.Integer, default=0)
+    neutral_count = db.Column(db.Integer, default=0)
+    negative_count = db.Column(db.Integer, default=0)
+    # Sum of sentiment_score over entries whose analysis is complete
+    sentiment_sum = db.Column(db.Float, default=0.0)
+    
+    @classmethod
+    def for_date(cls, date):
+        """Load the rollup row for a date, adding an empty one to the session if missing"""
+        row = db.session.get(cls, date)
+        if row is None:
+            row = cls(date=date, entry_count=0, mood_sum=0, mood_sum_sq=0, positive_count=0,
+                      neutral_count=0, negative_count=0, sentiment_sum=0.0)
+            db.session.add(row)
+        return row
+    
+    def add_mood(self, mood):
+        self.entry_count += 1
+        self.mood_sum += mood
+        self.mood_sum_sq += mood * mood
+    
+    def add_sentiment(self, label, score, delta=1):
+        column = f'{label}_count'
+        if label and hasattr(self, column):
+            setattr(self, column, getattr(self, column) + delta)
+            self.sentiment_sum += (score or 0.0) * delta
+    
+    def __repr__(self):
+        return f'<DailyMood {self.date}: {self.entry_count} entries>'
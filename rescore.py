@@ -0,0 +1,109 @@
+from collections import OrderedDict
+import numpy as np
+from sqlalchemy import select, update
+from models import db, Entry
+from analytics import rebuild_stats
+
+# Entry column holding the score of each built-in scoring stage
+STAGE_COLUMNS = OrderedDict([
+    ('vader', Entry.vader_compound),
+    ('textblob', Entry.textblob_polarity),
+    ('psychology', Entry.psychology_score),
+    ('intensity', Entry.emotional_intensity),
+])
+
+def combine_scores(components, weights, total_weight, stage_count):
+    """
+    Vectorized SentimentAnalyzer.combine_scores over many entries
+    
+    Args:
+        components (ndarray): (entries, stages) stage scores, NaN where a stage was skipped
+        weights (ndarray): Weight of each stage column
+        total_weight (float): Sum of the weights of all registered stages
+        stage_count (int): Number of registered stages
+    
+    Returns:
+        ndarray: Combined score per entry, clipped to [-1, 1]
+    """
+    ran = ~np.isnan(components)
+    scores = np.where(ran, components, 0.0)
+    
+    # Accumulate stage by stage in the analyzer's order rather than with a matrix
+    # product, so the floating point sums (and labels at the threshold) match it
+    combined = np.zeros(len(components))
+    ran_weight = np.zeros(len(components))
+    for column, weight in enumerate(weights):
+        combined += scores[:, column] * weight
+        ran_weight += ran[:, column] * weight
+    
+    # Scale partial results up to the full weight total, as combine_scores does
+    partial = (ran_weight > 0) & (ran.sum(axis=1) < stage_count)
+    combined[partial] *= total_weight / ran_weight[partial]
+    
+    return np.clip(combined, -1.0, 1.0)
+
+def classify_scores(scores, threshold):
+    """Vectorized SentimentAnalyzer.classify_sentiment"""
+    return np.where(scores >= threshold, 'positive',
+                    np.where(scores <= -threshold, 'negative', 'neutral'))
+
+def rescore_entries(analyzer, batch_size=5000):
+    """
+    Recompute combined scores and labels from the stored component scores
+    
+    Uses the analyzer's current weights and label threshold, so tuning them
+    does not require re-running NLP over every entry. Entries stored without
+    component scores are skipped. Running aggregates are rebuilt afterwards.
+    
+    Args:
+        analyzer (SentimentAnalyzer): Source of the weights and threshold
+        batch_size (int): Entries read and updated per batch
+    
+    Returns:
+        dict: Numbers of entries scanned, updated and skipped
+    """
+    weights = np.array([analyzer.weights[name] for name in STAGE_COLUMNS])
+    total_weight = sum(analyzer.weights[name] for name in analyzer.scorers)
+    stage_count = len(analyzer.scorers)
+    counts = {'scanned': 0, 'updated': 0, 'skipped': 0}
+    
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select(Entry.id, Entry.sentiment_score, Entry.sentiment_label, *STAGE_COLUMNS.values())
+            .where(Entry.id > last_id, Entry.sentiment_status == 'complete')
+            .order_by(Entry.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        counts['scanned'] += len(rows)
+        
+        ids = np.array([row[0] for row in rows])
+        old_scores = np.array([row[1] for row in rows], dtype=float)
+        old_labels = np.array([row[2] for row in rows], dtype=object)
+        components = np.array([row[3:] for row in rows], dtype=float)
+        
+        scored = ~np.isnan(components).all(axis=1)
+        counts['skipped'] += int((~scored).sum())
+        
+        combined = combine_scores(components[scored], weights, total_weight, stage_count)
+        labels = classify_scores(combined, analyzer.label_threshold)
+        # np.round scales by 1000 and can round differently from round(), which analyze() uses
+        new_scores = np.array([round(score, 3) for score in combined.tolist()])
+        
+        # Only write rows whose score or label actually changed
+        changed = (new_scores != old_scores[scored]) | (labels != old_labels[scored])
+        mappings = [
+            {'id': int(entry_id), 'sentiment_score': float(score), 'sentiment_label': str(label)}
+            for entry_id, score, label in zip(ids[scored][changed], new_scores[changed], labels[changed])
+        ]
+        if mappings:
+            db.session.execute(update(Entry), mappings)
+            counts['updated'] += len(mappings)
+        db.session.commit()
+    
+    rebuild_stats()
+    db.session.commit()
+    return counts
@@ -1,8 +1,117 @@
 import re
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
-from textblob import TextBlob
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
 import logging
+import threading
+import time
+from lexicon import MODIFIER, PSYCHOLOGY_LEXICON, match_phrase
+
+# nltk and textblob are imported lazily: importing them alone takes ~0.3s,
+# which every worker boot and test import would otherwise pay up front
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever scoring changes, so cached results are not reused across versions
+ANALYZER_VERSION = '3'
+
+# Weight of each scoring stage in the combined score
+DEFAULT_WEIGHTS = {
+    'vader': 0.35,        # VADER is good for social media text
+    'textblob': 0.25,     # TextBlob for general sentiment
+    'psychology': 0.30,   # Our psychology-specific analysis
+    'intensity': 0.10     # Emotional intensity modifier
+}
+
+# Named stage selections; 'full' runs every registered stage
+PROFILES = {
+    'fast': ('vader', 'psychology'),
+}
+
+# Stage selection of the 'cascade' profile, whose stages are chosen per entry:
+# cheap stages run first and expensive ones (cost >= EXPENSIVE_STAGE_COST) only
+# when the cheap ones are not confident enough
+CASCADE = ('cascade',)
+EXPENSIVE_STAGE_COST = 5
+
+# A pluggable scoring stage: func(context) -> (score, dict of result fields);
+# cost is the stage's relative expense, used to order cheap stages first
+Scorer = namedtuple('Scorer', ['name', 'func', 'cost'])
+
+# Contractions expanded during preprocessing (matched case-insensitively)
+DEFAULT_CONTRACTIONS = {
+    "i'm": "i am", "i've": "i have", "i'll": "i will",
+    "i'd": "i would", "you're": "you are", "you've": "you have",
+    "you'll": "you will", "you'd": "you would", "he's": "he is",
+    "she's": "she is", "it's": "it is", "we're": "we are",
+    "they're": "they are", "can't": "cannot", "won't": "will not",
+    "don't": "do not", "didn't": "did not", "couldn't": "could not",
+    "wouldn't": "would not", "shouldn't": "should not"
+}
+
+# Words that signal heightened emotional intensity
+INTENSITY_INDICATORS = frozenset({
+    'very', 'extremely', 'incredibly', 'totally', 'completely',
+    'absolutely', 'utterly', 'deeply', 'intensely', 'overwhelming',
+    'devastating', 'amazing', 'fantastic', 'terrible', 'awful'
+})
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+TOKEN_PATTERN = re.compile(r'\S+')
+
+# Per-process analyzer used by analyze_batch worker processes
+_batch_analyzer = None
+
+def _init_batch_worker(options):
+    global _batch_analyzer
+    _batch_analyzer = SentimentAnalyzer(**options)
+
+def _analyze_in_worker(text):
+    return _batch_analyzer.analyze(text)
+
+def copy_result(result):
+    """Copy an analysis result so cached values can't be mutated by callers"""
+    copy = dict(result, stages=list(result['stages']))
+    if result['vader_scores'] is not None:
+        copy['vader_scores'] = dict(result['vader_scores'])
+    return copy
+
+class ScoringContext:
+    """Inputs shared by every scoring stage for one entry"""
+    __slots__ = ('text', 'cleaned_text', 'tokens')
+    
+    def __init__(self, text, cleaned_text, tokens):
+        self.text = text
+        self.cleaned_text = cleaned_text
+        self.tokens = tokens
+
+class TokenStream:
+    """
+    Whitespace tokens of a preprocessed entry
+    
+    Built once per analysis and shared by every scoring stage, so the text
+    is only split a single time.
+    """
+    __slots__ = ('text', 'words', '_offsets')
+    
+    def __init__(self, text):
+        self.text = text
+        self.words = text.split()
+        self._offsets = None
+    
+    @property
+    def offsets(self):
+        """(start, end) character offsets of each word, computed on first use"""
+        if self._offsets is None:
+            self._offsets = [match.span() for match in TOKEN_PATTERN.finditer(self.text)]
+        return self._offsets
+    
+    def __len__(self):
+        return len(self.words)
+    
+    def __iter__(self):
+        return iter(self.words)
 
 class SentimentAnalyzer:
     """
@@ -10,176 +119,467 @@ class SentimentAnalyzer:
     with psychology-specific enhancements for mood journaling
     """
     
-    def __init__(self):
-        self.setup_nltk()
-        self.sia = SentimentIntensityAnalyzer()
-        
-        # Psychology and mental health specific word lists
-        self.positive_psychology_words = {
-            'grateful': 2.0, 'thankful': 1.8, 'blessed': 1.5, 'accomplished': 2.2,
-            'proud': 2.0, 'confident': 1.8, 'optimistic': 1.9, 'hopeful': 2.1,
-            'peaceful': 1.7, 'content': 1.5, 'fulfilled': 2.3, 'motivated': 1.9,
-            'inspired': 2.0, 'energetic': 1.6, 'relaxed': 1.4, 'calm': 1.3,
-            'balanced': 1.5, 'centered': 1.4, 'empowered': 2.1, 'resilient': 2.0,
-            'progress': 1.7, 'growth': 1.8, 'breakthrough': 2.2, 'healing': 1.9
-        }
+    def __init__(self, contractions=None, cache=None, nltk_data_path=None, offline=False,
+                 lexicon=None, weights=None, profile='full', cascade_threshold=0.8,
+                 label_threshold=0.15):
+        """
+        Args:
+            contractions (dict): Contraction table; defaults to DEFAULT_CONTRACTIONS
+            lexicon (Lexicon): Psychology lexicon; defaults to PSYCHOLOGY_LEXICON
+            weights (dict): Stage weights overriding DEFAULT_WEIGHTS
+            profile: Default stage selection: 'full', 'cascade', a PROFILES name
+                or a tuple of stage names
+            cascade_threshold (float): Confidence at which the 'cascade' profile
+                skips expensive stages
+            label_threshold (float): Combined score magnitude needed for a
+                positive or negative label
+            cache: Optional result cache (e.g. cache.LRUCache)
+            nltk_data_path (str): Directory with vendored NLTK data, searched first
+            offline (bool): Never download NLTK data; fail if it is missing
+        
+        NLTK and TextBlob resources are loaded on first use (or by warm_up),
+        so constructing an analyzer is cheap.
+        """
+        self.nltk_data_path = nltk_data_path
+        self.offline = offline
+        self._sia = None
+        self._textblob = None
+        self._load_lock = threading.Lock()
+        # Seconds spent loading each lazily initialized resource
+        self.load_times = {}
+        
+        # Optional result cache (e.g. cache.LRUCache) keyed on a hash of the text
+        self.cache = cache
+        
+        # Contraction expansion runs as one pass of a single precompiled alternation
+        contractions = DEFAULT_CONTRACTIONS if contractions is None else contractions
+        self.contractions = {key.lower(): value for key, value in contractions.items()}
+        self.contraction_pattern = None
+        if self.contractions:
+            # Longest first so that overlapping contractions prefer the fullest match
+            alternatives = sorted(self.contractions, key=len, reverse=True)
+            self.contraction_pattern = re.compile(
+                r'\b(?:' + '|'.join(map(re.escape, alternatives)) + r')\b',
+                re.IGNORECASE
+            )
+        
+        # Psychology words, phrases and intensity modifiers, shared process-wide
+        self.lexicon = PSYCHOLOGY_LEXICON if lexicon is None else lexicon
+        self.phrase_trie = self.lexicon.phrase_trie
+        
+        # Scoring stages, run in registration order and combined with these weights
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.profile = profile
+        self.cascade_threshold = cascade_threshold
+        self.label_threshold = label_threshold
+        self.scorers = OrderedDict()
+        self.register_scorer('vader', self._score_vader, cost=2)
+        self.register_scorer('textblob', self._score_textblob, cost=10)
+        self.register_scorer('psychology', self._score_psychology, cost=1)
+        self.register_scorer('intensity', self._score_intensity, cost=1)
+    
+    def register_scorer(self, name, func, weight=None, cost=1):
+        """
+        Add or replace a scoring stage
         
-        self.negative_psychology_words = {
-            'anxious': -2.1, 'overwhelmed': -2.3, 'depressed': -2.5, 'hopeless': -2.8,
-            'frustrated': -1.9, 'lonely': -2.0, 'stressed': -2.2, 'worried': -1.8,
-            'disappointed': -1.7, 'exhausted': -2.0, 'burnout': -2.4, 'numb': -1.9,
-            'empty': -2.1, 'worthless': -2.7, 'helpless': -2.4, 'trapped': -2.2,
-            'confused': -1.5, 'lost': -1.8, 'broken': -2.3, 'struggling': -1.9,
-            'panic': -2.6, 'fear': -1.8, 'terror': -2.5, 'dread': -2.2
-        }
+        Args:
+            name (str): Stage name, used in profiles and weights
+            func (callable): func(ScoringContext) -> (score in [-1, 1], dict of result fields)
+            weight (float): Weight in the combined score; defaults to DEFAULT_WEIGHTS or 0
+            cost (float): Relative expense of the stage
+        """
+        self.scorers[name] = Scorer(name, func, cost)
+        if weight is not None:
+            self.weights[name] = weight
+        self.weights.setdefault(name, 0.0)
+        self._update_cache_namespace()
+    
+    def _update_cache_namespace(self):
+        # Component scores depend on the code, lexicon and contraction table; this is
+        # the version stamped on stored entries (weights and thresholds only affect
+        # how components are combined, which rescore.py can redo without NLP)
+        contractions = json.dumps(sorted(self.contractions.items()))
+        self.model_version = (f"{ANALYZER_VERSION}:{self.lexicon.version}:"
+                              f"{hashlib.sha1(contractions.encode()).hexdigest()[:8]}")
+        
+        # Results also depend on the weights and thresholds, so all are part of the cache key
+        config = json.dumps([sorted(self.weights.items()), self.cascade_threshold, self.label_threshold])
+        self.cache_namespace = f"{self.model_version}:{hashlib.sha1(config.encode()).hexdigest()[:12]}"
+    
+    def resolve_profile(self, profile=None):
+        """Return the tuple of stage names selected by a profile (CASCADE for 'cascade')"""
+        profile = self.profile if profile is None else profile
+        if profile == 'full':
+            return tuple(self.scorers)
+        if profile == 'cascade':
+            return CASCADE
+        if isinstance(profile, str):
+            if profile not in PROFILES:
+                raise ValueError(f"Unknown scoring profile: {profile}")
+            stages = PROFILES[profile]
+        else:
+            stages = tuple(profile)
+        unknown = [name for name in stages if name not in self.scorers]
+        if unknown:
+            raise ValueError(f"Unknown scoring stages: {', '.join(unknown)}")
+        return stages
+        
+    @property
+    def sia(self):
+        """VADER analyzer, created (with its lexicon) on first use"""
+        if self._sia is None:
+            with self._load_lock:
+                if self._sia is None:
+                    start = time.perf_counter()
+                    self.setup_nltk()
+                    from nltk.sentiment import SentimentIntensityAnalyzer
+                    self._sia = SentimentIntensityAnalyzer()
+                    self._record_load_time('vader', start)
+        return self._sia
+    
+    @property
+    def textblob(self):
+        """TextBlob class, imported on first use"""
+        if self._textblob is None:
+            with self._load_lock:
+                if self._textblob is None:
+                    start = time.perf_counter()
+                    from textblob import TextBlob
+                    self._textblob = TextBlob
+                    self._record_load_time('textblob_import', start)
+        return self._textblob
+    
+    def warm_up(self):
+        """
+        Load every lazily initialized resource now, e.g. at worker boot
         
-        # Emotional intensity modifiers
-        self.intensity_modifiers = {
-            'very': 1.3, 'extremely': 1.5, 'incredibly': 1.4, 'really': 1.2,
-            'quite': 1.1, 'pretty': 1.1, 'somewhat': 0.8, 'slightly': 0.7,
-            'a bit': 0.6, 'a little': 0.6, 'totally': 1.4, 'completely': 1.5
-        }
+        Runs one analysis so TextBlob's sentiment lexicon is parsed as well.
         
+        Returns:
+            dict: Seconds spent loading each resource
+        """
+        start = time.perf_counter()
+        self.sia
+        self.textblob
+        self._analyze_text('Warming up: feeling calm, hopeful and a bit tired today!',
+                           tuple(self.scorers))
+        self._record_load_time('warm_up', start)
+        return dict(self.load_times)
+    
     def setup_nltk(self):
-        """Download required NLTK data"""
+        """Locate required NLTK data, downloading it unless running offline"""
+        import nltk
+        
+        if self.nltk_data_path and self.nltk_data_path not in nltk.data.path:
+            nltk.data.path.insert(0, self.nltk_data_path)
+        
         try:
-            nltk.data.find('vader_lexicon')
+            nltk.data.find('sentiment/vader_lexicon.zip')
         except LookupError:
+            if self.offline:
+                raise LookupError(
+                    "VADER lexicon not found and offline mode is on; vendor it with "
+                    "'python -m nltk.downloader -d <NLTK_DATA_PATH> vader_lexicon'"
+                )
             print("Downloading VADER lexicon...")
             nltk.download('vader_lexicon', quiet=True)
         
         try:
-            nltk.data.find('punkt')
+            nltk.data.find('tokenizers/punkt')
         except LookupError:
-            print("Downloading punkt tokenizer...")
-            nltk.download('punkt', quiet=True)
+            # punkt is only needed for TextBlob tokenization, not for sentiment scoring
+            if not self.offline:
+                print("Downloading punkt tokenizer...")
+                nltk.download('punkt', quiet=True)
+    
+    def worker_options(self):
+        """Constructor arguments for equivalent analyzers in worker processes"""
+        return {
+            'contractions': self.contractions,
+            'nltk_data_path': self.nltk_data_path,
+            'offline': self.offline,
+            'lexicon': self.lexicon,
+            'weights': self.weights,
+            'profile': self.profile,
+            'cascade_threshold': self.cascade_threshold,
+            'label_threshold': self.label_threshold
+        }
+    
+    def _record_load_time(self, resource, start):
+        self.load_times[resource] = time.perf_counter() - start
+        logger.info("Loaded %s in %.3fs", resource, self.load_times[resource])
     
-    def analyze(self, text):
+    def analyze(self, text, profile=None):
         """
         Comprehensive sentiment analysis combining multiple approaches
         
         Args:
             text (str): Journal entry text to analyze
+            profile: Stage selection ('full', 'fast', a tuple of stage names);
+                defaults to the analyzer's profile
             
         Returns:
-            dict: Sentiment analysis results including scores and classification
+            dict: Sentiment analysis results including scores and classification;
+                fields of stages that did not run are None
         """
+        stages = self.resolve_profile(profile)
+        
         if not text or not text.strip():
             return self._empty_result()
         
-        # Preprocess text
+        # Results depend only on the whitespace-normalized text, which keys the cache
+        text = WHITESPACE_PATTERN.sub(' ', text.strip())
+        if self.cache is None:
+            return self._analyze_text(text, stages)
+        
+        key = self.cache_key(text, stages)
+        result = self.cache.get(key)
+        if result is None:
+            result = self._analyze_text(text, stages)
+            self.cache.set(key, result)
+        return copy_result(result)
+    
+    def _analyze_text(self, text, stages):
+        """Run the selected scoring stages on whitespace-normalized text"""
+        # Preprocess and tokenize once for all scoring stages
         cleaned_text = self.preprocess_text(text)
+        context = ScoringContext(text, cleaned_text, self.tokenize(cleaned_text))
+        
+        result = {
+            'vader_scores': None,
+            'textblob_polarity': None,
+            'textblob_subjectivity': None,
+            'psychology_score': None,
+            'emotional_intensity': None
+        }
+        scores = {}
+        if stages == CASCADE:
+            self._run_cascade(context, result, scores)
+        else:
+            for name in stages:
+                scores[name], fields = self.scorers[name].func(context)
+                result.update(fields)
         
-        # VADER sentiment analysis
-        vader_scores = self.sia.polarity_scores(cleaned_text)
-        
-        # TextBlob sentiment analysis
-        blob = TextBlob(cleaned_text)
-        textblob_polarity = blob.sentiment.polarity
-        textblob_subjectivity = blob.sentiment.subjectivity
-        
-        # Psychology-specific analysis
-        psych_score = self.psychology_weighted_analysis(cleaned_text)
-        
-        # Emotional intensity analysis
-        intensity_score = self.analyze_emotional_intensity(cleaned_text)
+        # Combine in registration order so results don't depend on evaluation order
+        scores = OrderedDict((name, scores[name]) for name in self.scorers if name in scores)
+        return self._finish_result(result, scores, context)
+    
+    def _run_cascade(self, context, result, scores):
+        """
+        Run cheap stages first and expensive ones only when confidence is low
         
+        Stages that ran are reported in the result's 'stages' field.
+        """
+        by_cost = sorted(self.scorers.values(), key=lambda scorer: scorer.cost)
+        for scorer in by_cost:
+            if scorer.cost >= EXPENSIVE_STAGE_COST:
+                confidence = self.calculate_confidence(
+                    result['vader_scores'], scores.get('textblob'), scores.get('psychology')
+                )
+                if confidence >= self.cascade_threshold:
+                    break
+            scores[scorer.name], fields = scorer.func(context)
+            result.update(fields)
+        
+    def _finish_result(self, result, scores, context):
+        """Combine stage scores into the final label and confidence"""
         # Combined weighted score
-        combined_score = self.calculate_combined_score(
-            vader_scores['compound'],
-            textblob_polarity,
-            psych_score,
-            intensity_score
-        )
+        combined_score = self.combine_scores(scores)
         
         # Classify sentiment
         sentiment_label = self.classify_sentiment(combined_score)
         
         # Confidence score
         confidence = self.calculate_confidence(
-            vader_scores, textblob_polarity, psych_score
+            result['vader_scores'], scores.get('textblob'), scores.get('psychology')
         )
         
-        return {
+        result.update({
             'compound_score': round(combined_score, 3),
             'sentiment_label': sentiment_label,
             'confidence': round(confidence, 3),
-            'vader_scores': vader_scores,
-            'textblob_polarity': round(textblob_polarity, 3),
-            'textblob_subjectivity': round(textblob_subjectivity, 3),
-            'psychology_score': round(psych_score, 3),
-            'emotional_intensity': round(intensity_score, 3),
-            'word_count': len(cleaned_text.split())
+            'word_count': len(context.tokens),
+            'stages': list(scores),
+            'analyzer_version': self.model_version
+        })
+        return result
+    
+    def _score_vader(self, context):
+        vader_scores = self.sia.polarity_scores(context.cleaned_text)
+        return vader_scores['compound'], {'vader_scores': vader_scores}
+    
+    def _score_textblob(self, context):
+        sentiment = self.textblob(context.cleaned_text).sentiment
+        # Stages combine the rounded scores they store, so rescore.py reproduces them exactly
+        polarity = round(sentiment.polarity, 3)
+        return polarity, {
+            'textblob_polarity': polarity,
+            'textblob_subjectivity': round(sentiment.subjectivity, 3)
         }
     
+    def _score_psychology(self, context):
+        score = round(self.psychology_weighted_analysis(context.cleaned_text, context.tokens), 3)
+        return score, {'psychology_score': score}
+    
+    def _score_intensity(self, context):
+        score = round(self.analyze_emotional_intensity(context.cleaned_text, context.tokens, context.text), 3)
+        return score, {'emotional_intensity': score}
+    
+    def analyze_batch(self, texts, processes=None, chunksize=32):
+        """
+        Analyze many texts in one call, e.g. for imports and backfills
+        
+        Args:
+            texts (iterable): Journal entry texts to analyze
+            processes (int): Fan out across this many worker processes;
+                None or 1 analyzes in the current process
+            chunksize (int): Number of texts sent to a worker process at a time
+        
+        Returns:
+            list: One analyze() result per input text, in input order
+        """
+        texts = list(texts)
+        
+        # Identical texts (common in imports) are only analyzed once
+        unique_texts = list(dict.fromkeys(texts))
+        
+        if processes and processes > 1 and len(unique_texts) > chunksize:
+            # Only texts missing from the cache are shipped to worker processes
+            by_text = {}
+            misses = []
+            for text in unique_texts:
+                cached = self.cached_result(text)
+                if cached is None:
+                    misses.append(text)
+                else:
+                    by_text[text] = cached
+            
+            if misses:
+                with ProcessPoolExecutor(max_workers=processes,
+                                         initializer=_init_batch_worker,
+                                         initargs=(self.worker_options(),)) as pool:
+                    results = pool.map(_analyze_in_worker, misses, chunksize=chunksize)
+                    for text, result in zip(misses, results):
+                        self.cache_result(text, result)
+                        by_text[text] = result
+        else:
+            analyze = self.analyze
+            by_text = {text: analyze(text) for text in unique_texts}
+        
+        # Every position gets its own copy: duplicate texts must not share a result,
+        # and results from the process pool are also held by the cache
+        return [copy_result(by_text[text]) for text in texts]
+    
+    def cache_key(self, text, stages):
+        """Cache key for whitespace-normalized text under this analyzer's configuration"""
+        key = f"{self.cache_namespace}:{','.join(stages)}\0{text}"
+        return hashlib.sha256(key.encode()).hexdigest()
+    
+    def cached_result(self, text):
+        """Return the cached analysis of text, or None if absent or caching is off"""
+        if self.cache is None or not text or not text.strip():
+            return None
+        key = self.cache_key(WHITESPACE_PATTERN.sub(' ', text.strip()), self.resolve_profile())
+        result = self.cache.get(key)
+        return copy_result(result) if result is not None else None
+    
+    def cache_result(self, text, result):
+        if self.cache is not None and text and text.strip():
+            key = self.cache_key(WHITESPACE_PATTERN.sub(' ', text.strip()), self.resolve_profile())
+            self.cache.set(key, result)
+    
     def preprocess_text(self, text):
         """Clean and normalize text for analysis"""
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text.strip())
+        text = WHITESPACE_PATTERN.sub(' ', text.strip())
         
         # Handle common contractions
-        contractions = {
-            "i'm": "i am", "i've": "i have", "i'll": "i will",
-            "i'd": "i would", "you're": "you are", "you've": "you have",
-            "you'll": "you will", "you'd": "you would", "he's": "he is",
-            "she's": "she is", "it's": "it is", "we're": "we are",
-            "they're": "they are", "can't": "cannot", "won't": "will not",
-            "don't": "do not", "didn't": "did not", "couldn't": "could not",
-            "wouldn't": "would not", "shouldn't": "should not"
-        }
-        
-        for contraction, expansion in contractions.items():
-            text = re.sub(r'\b' + contraction + r'\b', expansion, text, flags=re.IGNORECASE)
+        if self.contraction_pattern is not None:
+            text = self.contraction_pattern.sub(self._expand_contraction, text)
         
         return text.lower()
     
-    def psychology_weighted_analysis(self, text):
-        """Analyze sentiment using psychology-specific word weights"""
-        words = text.split()
+    def _expand_contraction(self, match):
+        return self.contractions[match.group(0).lower()]
+    
+    def tokenize(self, text):
+        """Split preprocessed text into a TokenStream shared by the scorers"""
+        return TokenStream(text)
+    
+    def psychology_weighted_analysis(self, text, tokens=None):
+        """
+        Analyze sentiment using psychology-specific word and phrase weights
+        
+        Single words are looked up in the lexicon's flat index; multi-word terms
+        ("burned out") and modifiers ("a little") are matched against the phrase
+        trie, preferring the longest match, in a single left-to-right pass. A
+        modifier scales the term that immediately follows it.
+        """
+        if tokens is None:
+            tokens = self.tokenize(text)
+        words = tokens.words
         total_score = 0.0
         word_count = len(words)
         
         if word_count == 0:
             return 0.0
         
-        for i, word in enumerate(words):
-            word_score = 0.0
+        trie = self.phrase_trie
+        lookup = self.lexicon.lookup
+        scores = self.lexicon.scores
+        kinds = self.lexicon.kinds
+        modifier = 1.0
+        i = 0
+        while i < word_count:
+            word = words[i]
+            match = match_phrase(trie, words, i) if word in trie else None
+            if match is not None:
+                slot, length = match
+            else:
+                slot, length = lookup(word), 1
+                if slot < 0:
+                    modifier = 1.0
+                    i += 1
+                    continue
             
-            # Check psychology-specific words
-            if word in self.positive_psychology_words:
-                word_score = self.positive_psychology_words[word]
-            elif word in self.negative_psychology_words:
-                word_score = self.negative_psychology_words[word]
-            
-            # Apply intensity modifiers
-            if i > 0 and words[i-1] in self.intensity_modifiers:
-                modifier = self.intensity_modifiers[words[i-1]]
-                word_score *= modifier
-            
-            total_score += word_score
+            if kinds[slot] == MODIFIER:
+                modifier = scores[slot]
+            else:
+                total_score += scores[slot] * modifier
+                modifier = 1.0
+            i += length
         
         # Normalize by word count
         return total_score / word_count
     
-    def analyze_emotional_intensity(self, text):
-        """Analyze the emotional intensity of the text"""
-        words = text.split()
-        intensity_indicators = [
-            'very', 'extremely', 'incredibly', 'totally', 'completely',
-            'absolutely', 'utterly', 'deeply', 'intensely', 'overwhelming',
-            'devastating', 'amazing', 'fantastic', 'terrible', 'awful'
-        ]
+    def analyze_emotional_intensity(self, text, tokens=None, original_text=None):
+        """
+        Analyze the emotional intensity of the text
         
-        intensity_count = sum(1 for word in words if word in intensity_indicators)
+        Args:
+            text (str): Preprocessed (lowercased) text
+            tokens (TokenStream): Tokens of the preprocessed text, if already computed
+            original_text (str): Text as written, used to measure capitalization
+        """
+        if tokens is None:
+            tokens = self.tokenize(text)
+        words = tokens.words
+        
+        intensity_count = sum(1 for word in words if word in INTENSITY_INDICATORS)
         
-        # Punctuation-based intensity (exclamation marks, caps)
-        exclamation_count = text.count('!')
-        caps_ratio = sum(1 for c in text if c.isupper()) / max(len(text), 1)
+        # Punctuation-based intensity (exclamation marks, caps). Capitals only
+        # survive in the original text; str.count and map(str.isupper) scan in C,
+        # which beats a combined per-character Python loop
+        source = original_text or text
+        exclamation_count = source.count('!')
+        sentence_count = source.count('.') + 1
+        caps_count = 0 if source.islower() else sum(map(str.isupper, source))
+        caps_ratio = caps_count / max(len(source), 1)
         
         # Combine intensity factors
         intensity_score = (
             (intensity_count / max(len(words), 1)) * 0.5 +
-            (exclamation_count / max(len(text.split('.')), 1)) * 0.3 +
+            (exclamation_count / sentence_count) * 0.3 +
             caps_ratio * 0.2
         )
         
@@ -187,40 +587,50 @@ class SentimentAnalyzer:
     
     def calculate_combined_score(self, vader_compound, textblob_polarity, 
                                 psych_score, intensity_score):
-        """Calculate weighted combination of all sentiment scores"""
-        # Weight the different components
-        weights = {
-            'vader': 0.35,        # VADER is good for social media text
-            'textblob': 0.25,     # TextBlob for general sentiment
-            'psychology': 0.30,    # Our psychology-specific analysis
-            'intensity': 0.10      # Emotional intensity modifier
+        """Calculate weighted combination of the built-in sentiment scores (None = stage skipped)"""
+        scores = {
+            'vader': vader_compound,
+            'textblob': textblob_polarity,
+            'psychology': psych_score,
+            'intensity': intensity_score
         }
+        return self.combine_scores({name: score for name, score in scores.items() if score is not None})
         
-        combined = (
-            vader_compound * weights['vader'] +
-            textblob_polarity * weights['textblob'] +
-            psych_score * weights['psychology'] +
-            intensity_score * weights['intensity']
-        )
+    def combine_scores(self, scores):
+        """
+        Calculate the weighted combination of stage scores
+        
+        When stages were skipped, the weights of the stages that ran are scaled
+        up to the full weight total so scores stay comparable across profiles.
+        """
+        combined = 0.0
+        ran_weight = 0.0
+        for name, score in scores.items():
+            weight = self.weights[name]
+            combined += score * weight
+            ran_weight += weight
+        
+        if ran_weight and len(scores) < len(self.scorers):
+            combined *= sum(self.weights[name] for name in self.scorers) / ran_weight
         
         # Ensure score stays within reasonable bounds
         return max(-1.0, min(1.0, combined))
     
     def classify_sentiment(self, combined_score):
         """Classify sentiment based on combined score"""
-        if combined_score >= 0.15:
+        if combined_score >= self.label_threshold:
             return 'positive'
-        elif combined_score <= -0.15:
+        elif combined_score <= -self.label_threshold:
             return 'negative'
         else:
             return 'neutral'
     
     def calculate_confidence(self, vader_scores, textblob_polarity, psych_score):
-        """Calculate confidence score based on agreement between methods"""
-        scores = [vader_scores['compound'], textblob_polarity, psych_score]
+        """Calculate confidence score based on agreement between methods (None = stage skipped)"""
+        scores = [vader_scores['compound'] if vader_scores else None, textblob_polarity, psych_score]
         
-        # Remove zero scores for confidence calculation
-        non_zero_scores = [s for s in scores if abs(s) > 0.05]
+        # Remove zero scores (and skipped stages) for confidence calculation
+        non_zero_scores = [s for s in scores if s is not None and abs(s) > 0.05]
         
         if len(non_zero_scores) < 2:
             return 0.5  # Low confidence if only one method has opinion
@@ -251,16 +661,27 @@ class SentimentAnalyzer:
             'textblob_subjectivity': 0.0,
             'psychology_score': 0.0,
             'emotional_intensity': 0.0,
-            'word_count': 0
+            'word_count': 0,
+            'stages': [],
+            'analyzer_version': self.model_version
         }
     
-    def get_sentiment_summary(self, text):
-        """Get a human-readable summary of the sentiment analysis"""
-        result = self.analyze(text)
+    def get_sentiment_summary(self, text=None, result=None):
+        """
+        Get a human-readable summary of the sentiment analysis
+        
+        Args:
+            text (str): Text to analyze; ignored when result is given
+            result (dict): Precomputed analyze() output, or stored scores with at
+                least sentiment_label, confidence and emotional_intensity
+        """
+        if result is None:
+            result = self.analyze(text)
         
         sentiment = result['sentiment_label'].title()
-        confidence = result['confidence']
-        intensity = result['emotional_intensity']
+        confidence = result['confidence'] or 0.0
+        # Profiles that skip the intensity stage leave it unset
+        intensity = result['emotional_intensity'] or 0.0
         
         # Create descriptive summary
         if confidence > 0.8:
@@ -0,0 +1,98 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from models import db, Entry
+from analytics import load_stats, record_sentiment
+
+class SentimentWorker:
+    """
+    Background sentiment scoring for entries committed in the 'pending' state
+    
+    Entries are written immediately and scored on a thread pool, so request
+    latency no longer depends on the cost of the NLP pipeline.
+    """
+    
+    def __init__(self, app, analyzer, max_workers=2):
+        self.app = app
+        self.analyzer = analyzer
+        self.max_workers = max_workers
+        self._executor = None
+        self._pid = None
+        self._futures = set()
+        self._lock = threading.Lock()
+    
+    @property
+    def executor(self):
+        # Pools don't survive fork, so each (gunicorn) worker process gets its own
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='sentiment'
+                )
+                self._pid = os.getpid()
+                self._futures = set()
+            return self._executor
+    
+    def submit(self, entry_id, content):
+        """Queue an entry for scoring"""
+        future = self.executor.submit(self._score, entry_id, content)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._discard)
+        return future
+    
+    def requeue_pending(self):
+        """Resubmit entries left pending by a previous process (e.g. after a restart)"""
+        with self.app.app_context():
+            pending = (db.session.query(Entry.id, Entry.content)
+                       .filter(Entry.sentiment_status == 'pending')
+                       .all())
+        for entry_id, content in pending:
+            self.submit(entry_id, content)
+        return len(pending)
+    
+    def wait(self, timeout=None):
+        """Block until all queued entries have been scored"""
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures, timeout=timeout)
+    
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+    
+    def _discard(self, future):
+        with self._lock:
+            self._futures.discard(future)
+    
+    def _score(self, entry_id, content):
+        try:
+            result = self.analyzer.analyze(content)
+        except Exception as e:
+            print(f"Error analyzing entry {entry_id}: {e}")
+            result = None
+        
+        if result is None:
+            values = {'sentiment_status': 'failed'}
+        else:
+            values = Entry.sentiment_values(result)
+        
+        with self.app.app_context():
+            try:
+                # Only the first writer to move the entry out of 'pending' updates the
+                # stats, so an entry requeued twice is never counted twice
+                updated = (Entry.query
+                           .filter(Entry.id == entry_id, Entry.sentiment_status == 'pending')
+                           .update(values, synchronize_session=False))
+                if updated and result is not None:
+                    timestamp = db.session.query(Entry.timestamp).filter(Entry.id == entry_id).scalar()
+                    record_sentiment(timestamp, result['sentiment_label'], result['compound_score'])
+                elif updated:
+                    # Not counted anywhere, but the entry changed, so cached responses must too
+                    load_stats(for_update=True).touch()
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                print(f"Error saving sentiment for entry {entry_id}: {e}")
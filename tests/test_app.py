@@ -1,6 +1,24 @@
+import os
+import statistics
+import tempfile
+import threading
 import unittest
-from app import app, db
-from models import Entry
+
+# Use a throwaway in-memory database instead of the instance database
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from app import app, db, sentiment_analyzer, sentiment_worker
+from models import DailyMood, Entry
+from analytics import (rebuild_daily_mood, entry_aggregates, entry_dates, load_stats,
+                       record_entry, streaks_from_dates)
+from insights import generate_psychology_insights, stats_summary
+from rescore import rescore_entries
+from backfill import backfill_entries
+from migrations import upgrade_schema
+from sentiment_analyzer import SentimentAnalyzer
+from datetime import datetime, timedelta
+from flask import Flask
+from unittest import mock
 import json
 
 class MoodMateTestCase(unittest.TestCase):
@@ -11,6 +29,24 @@ class MoodMateTestCase(unittest.TestCase):
         
         with app.app_context():
             db.create_all()
+    
+    def tearDown(self):
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+    
+    def add_entries(self, count, start=None):
+        start = start or datetime.utcnow()
+        with app.app_context():
+            for i in range(count):
+                db.session.add(Entry(
+                    mood_rating=(i % 5) + 1,
+                    content=f'Entry number {i}',
+                    sentiment_score=0.0,
+                    sentiment_label='neutral',
+                    timestamp=start - timedelta(hours=i)
+                ))
+            db.session.commit()
 
     def test_save_entry(self):
         response = self.app.post('/api/entries',
@@ -24,6 +60,465 @@ class MoodMateTestCase(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         data = json.loads(response.data)
         self.assertTrue(data['success'])
+    
+    def test_entry_summary_from_stored_scores(self):
+        response = self.app.post('/api/entries',
+            data=json.dumps({'mood': 5, 'content': 'I feel grateful, proud and hopeful'}),
+            content_type='application/json'
+        )
+        entry_id = json.loads(response.data)['entry_id']
+        
+        with mock.patch.object(sentiment_analyzer, 'analyze', side_effect=AssertionError):
+            response = self.app.get(f'/api/entries/{entry_id}/summary')
+        
+        summary = json.loads(response.data)
+        self.assertEqual(summary['sentiment'], 'Positive')
+        self.assertEqual(
+            summary['summary'],
+            sentiment_analyzer.get_sentiment_summary('I feel grateful, proud and hopeful')['summary']
+        )
+        self.assertEqual(self.app.get('/api/entries/999/summary').status_code, 404)
+    
+    def test_component_scores_persisted(self):
+        content = 'Totally burned out, but therapy helped a bit'
+        response = self.app.post('/api/entries',
+            data=json.dumps({'mood': 2, 'content': content}),
+            content_type='application/json'
+        )
+        entry_id = json.loads(response.data)['entry_id']
+        expected = sentiment_analyzer.analyze(content)
+        
+        entry = json.loads(self.app.get(f'/api/entries/{entry_id}').data)
+        self.assertEqual(entry['vader_compound'], expected['vader_scores']['compound'])
+        self.assertEqual(entry['textblob_subjectivity'], expected['textblob_subjectivity'])
+        self.assertEqual(entry['word_count'], expected['word_count'])
+        
+        with app.app_context():
+            result = db.session.get(Entry, entry_id).sentiment_result()
+            for key, value in result.items():
+                self.assertEqual(value, expected[key])
+        
+        page = json.loads(self.app.get('/api/entries?fields=psychology_score').data)
+        self.assertEqual(page, [{'psychology_score': expected['psychology_score']}])
+    
+    def test_conditional_get(self):
+        def post(content):
+            self.app.post('/api/entries', data=json.dumps({'mood': 4, 'content': content}),
+                          content_type='application/json')
+        
+        post('Feeling calm')
+        response = self.app.get('/api/entries')
+        etag = response.headers['ETag']
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+        self.assertIn('Last-Modified', response.headers)
+        
+        with mock.patch.object(Entry, 'page', side_effect=AssertionError):
+            response = self.app.get('/api/entries', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers['ETag'], etag)
+        
+        analytics_etag = self.app.get('/api/analytics').headers['ETag']
+        self.assertIn(datetime.utcnow().date().isoformat(), analytics_etag)
+        self.assertEqual(
+            self.app.get('/api/analytics', headers={'If-None-Match': analytics_etag}).status_code, 304)
+        
+        post('Feeling hopeful')
+        response = self.app.get('/api/entries', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(len(json.loads(response.data)), 2)
+        
+        # A recreated database restarts the data version at the same number
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+        post('Feeling calm')
+        self.assertEqual(self.app.get('/api/entries', headers={'If-None-Match': etag}).status_code, 200)
+
+    def test_entries_cursor_pagination(self):
+        self.add_entries(5)
+        
+        response = self.app.get('/api/entries?limit=2')
+        first_page = json.loads(response.data)
+        cursor = response.headers['X-Next-Cursor']
+        self.assertEqual([e['content'] for e in first_page], ['Entry number 0', 'Entry number 1'])
+        
+        seen = list(first_page)
+        while cursor:
+            response = self.app.get(f'/api/entries?limit=2&cursor={cursor}')
+            seen.extend(json.loads(response.data))
+            cursor = response.headers.get('X-Next-Cursor')
+        
+        self.assertEqual([e['content'] for e in seen], [f'Entry number {i}' for i in range(5)])
+    
+    def test_streaming_export(self):
+        self.add_entries(3)
+        
+        response = self.app.get('/api/entries/export')
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        rows = [json.loads(line) for line in response.data.decode().splitlines()]
+        self.assertEqual([row['content'] for row in rows],
+                         ['Entry number 2', 'Entry number 1', 'Entry number 0'])
+        
+        response = self.app.get('/api/entries/export?format=json&fields=id,mood_rating')
+        self.assertEqual(json.loads(response.data), [
+            {'id': 3, 'mood_rating': 3}, {'id': 2, 'mood_rating': 2}, {'id': 1, 'mood_rating': 1}
+        ])
+        
+        response = self.app.get('/api/entries/export?format=csv&fields=id,sentiment_label')
+        self.assertEqual(response.data.decode().splitlines(),
+                         ['id,sentiment_label', '3,neutral', '2,neutral', '1,neutral'])
+        
+        self.assertEqual(self.app.get('/api/entries/export?format=xml').status_code, 400)
+    
+    def test_entries_field_projection(self):
+        self.add_entries(1)
+        
+        response = self.app.get('/api/entries?fields=mood_rating,sentiment_label')
+        data = json.loads(response.data)
+        self.assertEqual(data, [{'mood_rating': 1, 'sentiment_label': 'neutral'}])
+        
+        response = self.app.get('/api/entries?fields=password')
+        self.assertEqual(response.status_code, 400)
+
+    def test_analytics_from_running_stats(self):
+        for mood, content in [(5, 'I feel grateful and proud'), (2, 'Anxious and overwhelmed'), (4, 'Calm day')]:
+            self.app.post('/api/entries',
+                data=json.dumps({'mood': mood, 'content': content}),
+                content_type='application/json'
+            )
+        
+        data = json.loads(self.app.get('/api/analytics').data)
+        self.assertEqual(data['total_entries'], 3)
+        self.assertEqual(data['avg_mood'], 3.7)
+        self.assertEqual(data['positive_ratio'], 67)
+        self.assertEqual(data['streak_days'], 1)
+    
+    def test_analytics_cache(self):
+        self.add_entries(4)
+        self.app.get('/api/analytics')
+        
+        with mock.patch('app.generate_psychology_insights', side_effect=AssertionError):
+            cached = json.loads(self.app.get('/api/analytics').data)
+        self.assertEqual(cached['total_entries'], 4)
+        
+        self.app.post('/api/entries', data=json.dumps({'mood': 5, 'content': 'Hopeful'}),
+                      content_type='application/json')
+        self.assertEqual(json.loads(self.app.get('/api/analytics').data)['total_entries'], 5)
+        
+        metrics = json.loads(self.app.get('/api/metrics/cache').data)
+        self.assertGreaterEqual(metrics['analytics']['hits'], 1)
+        self.assertIn('hit_rate', metrics['sentiment'])
+    
+    def test_stats_rebuilt_from_existing_entries(self):
+        self.add_entries(48)
+        
+        with app.app_context():
+            stats = load_stats()
+            self.assertEqual(stats.total_entries, 48)
+            self.assertEqual(stats.mood_sum, sum((i % 5) + 1 for i in range(48)))
+            self.assertEqual(stats.neutral_sentiment, 48)
+            self.assertGreaterEqual(stats.longest_streak, 2)
+
+    def test_rescore_with_new_weights(self):
+        contents = ['Grateful and hopeful', 'Hopeless and exhausted', 'A bit tired but okay']
+        self.app.post('/api/entries/bulk',
+            data=json.dumps([{'mood': 3, 'content': content} for content in contents]),
+            content_type='application/json'
+        )
+        self.add_entries(1)  # legacy entry without component scores
+        
+        tuned = SentimentAnalyzer(weights={'textblob': 0.0, 'intensity': 0.5}, label_threshold=0.3)
+        with app.app_context():
+            counts = rescore_entries(tuned, batch_size=2)
+            self.assertEqual(counts['scanned'], 4)
+            self.assertEqual(counts['skipped'], 1)
+            
+            entries = Entry.query.order_by(Entry.id).all()
+            for entry, content in zip(entries, contents):
+                expected = tuned.analyze(content)
+                self.assertAlmostEqual(entry.sentiment_score, expected['compound_score'], places=2)
+                self.assertEqual(entry.sentiment_label, expected['sentiment_label'])
+            
+            labels = [entry.sentiment_label for entry in entries]
+            self.assertEqual(load_stats().positive_sentiment, labels.count('positive'))
+        
+        result = app.test_cli_runner().invoke(args=['rescore'])
+        self.assertIn('Rescored 4 entries', result.output)
+    
+    def test_rescore_with_unchanged_config_is_noop(self):
+        words = ['not', 'happy', 'bad', 'I', 'sad', 'great', 'tired', 'so', 'calm', 'awful', 'proud']
+        contents = [' '.join(words[(i * 7 + j * 3) % len(words)] for j in range(2 + i % 6))
+                    for i in range(300)]
+        contents.append('not happy bad I not not')  # combined score right at the label threshold
+        self.app.post('/api/entries/bulk',
+            data=json.dumps([{'mood': 3, 'content': content} for content in contents]),
+            content_type='application/json'
+        )
+        
+        with app.app_context():
+            counts = rescore_entries(sentiment_analyzer)
+        self.assertEqual(counts['scanned'], len(contents))
+        self.assertEqual(counts['updated'], 0)
+    
+    def test_resumable_backfill(self):
+        self.add_entries(5)  # scored before versions were recorded
+        self.app.post('/api/entries',
+            data=json.dumps({'mood': 5, 'content': 'I feel grateful, proud and hopeful'}),
+            content_type='application/json'
+        )
+        
+        with app.app_context(), tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, 'backfill.json')
+            lines = []
+            
+            self.assertEqual(backfill_entries(sentiment_analyzer, 2, checkpoint_path=checkpoint,
+                                              limit=3, progress=lines.append), 3)
+            with open(checkpoint) as f:
+                self.assertEqual(json.load(f)['last_id'], 3)
+            self.assertTrue(lines[-1].startswith('3/3 entries backfilled'))
+            
+            self.assertEqual(backfill_entries(sentiment_analyzer, 2, checkpoint_path=checkpoint,
+                                              progress=lines.append), 2)
+            self.assertFalse(os.path.exists(checkpoint))
+            
+            versions = {entry.analyzer_version for entry in Entry.query}
+            self.assertEqual(versions, {sentiment_analyzer.model_version})
+            self.assertEqual(load_stats().neutral_sentiment,
+                             Entry.query.filter_by(sentiment_label='neutral').count())
+    
+    def test_streaks_from_distinct_dates(self):
+        today = datetime(2024, 3, 10, 20, 0)
+        for days_ago in (0, 1, 1, 2, 5, 6, 7, 8):
+            self.add_entries(1, today - timedelta(days=days_ago))
+        
+        with app.app_context():
+            dates = entry_dates()
+            self.assertEqual(len(dates), 7)
+            self.assertEqual(dates[0], today.date())
+            self.assertEqual(streaks_from_dates(dates), (3, 4))
+            
+            
+            stats = load_stats()
+            self.assertEqual((stats.current_streak, stats.longest_streak), (3, 4))
+            self.assertEqual(stats.streak_days(today.date()), 3)
+            self.assertEqual(stats.streak_days(today.date() + timedelta(days=1)), 3)
+            self.assertEqual(stats.streak_days(today.date() + timedelta(days=2)), 0)
+        
+        self.assertEqual(streaks_from_dates([]), (0, 0))
+    
+    def test_insights_from_running_stats(self):
+        self.add_entries(12)
+        moods = [(i % 5) + 1 for i in range(12)]  # newest first
+        
+        with app.app_context():
+            summary = stats_summary(load_stats())
+            
+        self.assertEqual(summary['total_entries'], 12)
+        self.assertAlmostEqual(summary['avg_mood'], statistics.mean(moods))
+        self.assertAlmostEqual(summary['mood_std'], statistics.pstdev(moods))
+        self.assertAlmostEqual(summary['recent_avg'], statistics.mean(moods[:7]))
+        self.assertEqual(summary['recent_week_entries'], 12)
+        self.assertEqual(summary['negative_sentiment'], 0)
+        
+        titles = [insight['title'] for insight in generate_psychology_insights(summary)]
+        self.assertIn('Excellent Consistency! 🌟', titles)
+    
+    def test_concurrent_writers_keep_running_stats(self):
+        # In-memory SQLite gives each thread its own database, so use a file
+        with tempfile.TemporaryDirectory() as directory:
+            file_app = Flask(__name__)
+            file_app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(directory, 'test.db')
+            db.init_app(file_app)
+            with file_app.app_context():
+                db.create_all()
+            
+            errors = []
+            def write_entries(thread):
+                for i in range(10):
+                    with file_app.app_context():
+                        try:
+                            entry = Entry(mood_rating=(i % 5) + 1, content=f'Thread {thread} entry {i}',
+                                          sentiment_score=0.5, sentiment_label='positive',
+                                          timestamp=datetime.utcnow())
+                            record_entry(entry)
+                            db.session.add(entry)
+                            db.session.commit()
+                        except Exception as e:
+                            errors.append(e)
+            
+            threads = [threading.Thread(target=write_entries, args=(n,)) for n in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            
+            with file_app.app_context():
+                self.assertEqual(errors, [])
+                stats = load_stats()
+                self.assertEqual(stats.total_entries, 60)
+                self.assertEqual(stats.positive_sentiment, 60)
+                self.assertEqual(stats.mood_sum, 6 * sum((i % 5) + 1 for i in range(10)))
+                self.assertEqual(DailyMood.query.with_entities(db.func.sum(DailyMood.entry_count)).scalar(), 60)
+                db.engine.dispose()
+    
+    def test_upgrade_schema_of_existing_database(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_app = Flask(__name__)
+            file_app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(directory, 'old.db')
+            db.init_app(file_app)
+            with file_app.app_context():
+                # Schema and data as created by the original release
+                with db.engine.begin() as connection:
+                    for statement in (
+                        'CREATE TABLE entries (id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                        'mood_rating INTEGER NOT NULL, content TEXT NOT NULL, sentiment_score REAL DEFAULT 0.0, '
+                        'sentiment_label VARCHAR(20), timestamp DATETIME, created_at DATETIME)',
+                        'CREATE TABLE user_stats (id INTEGER PRIMARY KEY AUTOINCREMENT, total_entries INTEGER, '
+                        'current_streak INTEGER, longest_streak INTEGER, avg_mood REAL, last_updated DATETIME)',
+                        "INSERT INTO entries (mood_rating, content, sentiment_score, sentiment_label, timestamp) "
+                        "VALUES (4, 'Calm', 0.4, 'positive', '2024-01-01 09:00:00.000000'), "
+                        "(2, 'Tired', -0.3, 'negative', '2024-01-02 09:00:00.000000')",
+                        "INSERT INTO user_stats (id, total_entries) VALUES (1, 2)"
+                    ):
+                        connection.exec_driver_sql(statement)
+                
+                changes = upgrade_schema()
+                self.assertIn('added column user_stats.mood_sum', changes)
+                self.assertIn('created index idx_entries_date', changes)
+                self.assertIn('created table daily_mood', changes)
+                
+                stats = load_stats()
+                self.assertEqual((stats.total_entries, stats.mood_sum, stats.longest_streak), (2, 6, 2))
+                self.assertEqual({entry.sentiment_status for entry in Entry.query}, {'complete'})
+                self.assertEqual(DailyMood.query.count(), 2)
+                self.assertEqual(upgrade_schema(), [])
+                db.session.remove()
+                db.engine.dispose()
+    
+    def test_entry_aggregates_single_query(self):
+        self.add_entries(10)
+        
+        with app.app_context():
+            aggregates = entry_aggregates()
+            moods = [(i % 5) + 1 for i in range(10)]
+            self.assertEqual(aggregates['count'], 10)
+            self.assertEqual(aggregates['avg_mood'], 3.0)
+            self.assertAlmostEqual(aggregates['mood_variance'], sum((m - 3) ** 2 for m in moods) / 10)
+            self.assertEqual(aggregates['positive_entries'], 4)
+            self.assertEqual(aggregates['label_counts'], {'positive': 0, 'neutral': 10, 'negative': 0})
+            
+            self.assertEqual(entry_aggregates(Entry.mood_rating == 5)['count'], 2)
+
+    def test_async_sentiment_pipeline(self):
+        app.config['SENTIMENT_ASYNC'] = True
+        try:
+            response = self.app.post('/api/entries',
+                data=json.dumps({'mood': 5, 'content': 'I feel grateful, proud and hopeful'}),
+                content_type='application/json'
+            )
+        finally:
+            app.config['SENTIMENT_ASYNC'] = False
+        
+        self.assertEqual(response.status_code, 202)
+        data = json.loads(response.data)
+        self.assertEqual(data['sentiment_status'], 'pending')
+        
+        sentiment_worker.wait(timeout=30)
+        entry = json.loads(self.app.get(f"/api/entries/{data['entry_id']}").data)
+        self.assertEqual(entry['sentiment_status'], 'complete')
+        self.assertEqual(entry['sentiment_label'], 'positive')
+        
+        with app.app_context():
+            self.assertEqual(load_stats().positive_sentiment, 1)
+            self.assertEqual(DailyMood.query.one().positive_count, 1)
+
+    def test_failed_async_analysis_changes_etag(self):
+        release = threading.Event()
+        def fail(content):
+            release.wait(timeout=30)
+            raise RuntimeError('analysis failed')
+        
+        app.config['SENTIMENT_ASYNC'] = True
+        try:
+            with mock.patch.object(sentiment_analyzer, 'analyze', side_effect=fail):
+                response = self.app.post('/api/entries',
+                    data=json.dumps({'mood': 3, 'content': 'Unlucky entry'}),
+                    content_type='application/json'
+                )
+                entry_id = json.loads(response.data)['entry_id']
+                etag = self.app.get('/api/entries').headers['ETag']
+                release.set()
+                sentiment_worker.wait(timeout=30)
+        finally:
+            app.config['SENTIMENT_ASYNC'] = False
+        
+        response = self.app.get('/api/entries', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)[0]['sentiment_status'], 'failed')
+        self.assertEqual(json.loads(self.app.get(f'/api/entries/{entry_id}').data)['sentiment_status'],
+                         'failed')
+    
+    def test_bulk_import(self):
+        response = self.app.post('/api/entries/bulk',
+            data=json.dumps({'entries': [
+                {'mood': 5, 'content': 'Grateful and hopeful', 'timestamp': '2024-01-02T09:00:00'},
+                {'mood': 1, 'content': 'Hopeless and exhausted', 'timestamp': '2024-01-01T09:00:00'},
+                {'mood': 5, 'content': 'Grateful and hopeful', 'timestamp': '2024-01-03T09:00:00'}
+            ]}),
+            content_type='application/json'
+        )
+        
+        data = json.loads(response.data)
+        self.assertTrue(data['success'])
+        self.assertEqual(data['sentiments'], ['positive', 'negative', 'positive'])
+        
+        with app.app_context():
+            stats = load_stats()
+            self.assertEqual(stats.total_entries, 3)
+            self.assertEqual(stats.longest_streak, 3)
+    
+    def test_timeseries_from_daily_rollup(self):
+        self.app.post('/api/entries/bulk',
+            data=json.dumps([
+                {'mood': 5, 'content': 'Grateful and hopeful', 'timestamp': '2024-01-30T09:00:00'},
+                {'mood': 3, 'content': 'Hopeless and exhausted', 'timestamp': '2024-01-30T21:00:00'},
+                {'mood': 1, 'content': 'Hopeless and exhausted', 'timestamp': '2024-02-01T09:00:00'}
+            ]),
+            content_type='application/json'
+        )
+        
+        response = self.app.get('/api/analytics/timeseries?from=2024-01-01&to=2024-02-29')
+        series = json.loads(response.data)['series']
+        self.assertEqual([day['period'] for day in series], ['2024-01-30', '2024-02-01'])
+        self.assertEqual(series[0]['entries'], 2)
+        self.assertEqual(series[0]['avg_mood'], 4.0)
+        self.assertEqual(series[0]['sentiment'], {'positive': 1, 'neutral': 0, 'negative': 1})
+        
+        response = self.app.get('/api/analytics/timeseries?from=2024-01-01&to=2024-02-29&bucket=month')
+        months = json.loads(response.data)['series']
+        self.assertEqual([(m['period'], m['entries']) for m in months], [('2024-01-01', 2), ('2024-02-01', 1)])
+        
+        with app.app_context():
+            maintained = [(d.date, d.entry_count, d.mood_sum_sq, d.negative_count, round(d.sentiment_sum, 6))
+                          for d in DailyMood.query.order_by(DailyMood.date)]
+            rebuild_daily_mood()
+            rebuilt = [(d.date, d.entry_count, d.mood_sum_sq, d.negative_count, round(d.sentiment_sum, 6))
+                       for d in DailyMood.query.order_by(DailyMood.date)]
+            self.assertEqual(maintained, rebuilt)
+        
+        self.assertEqual(self.app.get('/api/analytics/timeseries?bucket=year').status_code, 400)
+        self.assertEqual(self.app.get('/api/analytics/timeseries?from=2024-13-01').status_code, 400)
+    
+    def test_bulk_import_rejects_invalid_entry(self):
+        response = self.app.post('/api/entries/bulk',
+            data=json.dumps([{'mood': 3, 'content': 'Fine'}, {'mood': 9, 'content': 'Too high'}]),
+            content_type='application/json'
+        )
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Entry 1', json.loads(response.data)['error'])
 
 if __name__ == '__main__':
     unittest.main()
@@ -1 +1,177 @@
+import os
+import tempfile
+import unittest
+import pickle
+from cache import LRUCache, SQLiteStore
+from lexicon import MODIFIER, PSYCHOLOGY_LEXICON, VALENCE, Lexicon
+from sentiment_analyzer import SentimentAnalyzer
 
+class SentimentAnalyzerTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.analyzer = SentimentAnalyzer()
+    
+    def test_resources_load_lazily(self):
+        analyzer = SentimentAnalyzer()
+        self.assertEqual(analyzer.load_times, {})
+        
+        load_times = analyzer.warm_up()
+        
+        self.assertIn('vader', load_times)
+        self.assertIn('warm_up', load_times)
+        self.assertEqual(analyzer.analyze('calm'), self.analyzer.analyze('calm'))
+    
+    def test_preprocess_expands_contractions_in_one_pass(self):
+        self.assertEqual(
+            self.analyzer.preprocess_text("  I'm   sure We CAN'T stop,\nit's fine "),
+            "i am sure we cannot stop, it is fine"
+        )
+    
+    def test_custom_contraction_table(self):
+        analyzer = SentimentAnalyzer(contractions={"y'all": "you all"})
+        
+        self.assertEqual(analyzer.preprocess_text("Y'all can't"), "you all can't")
+        self.assertEqual(SentimentAnalyzer(contractions={}).preprocess_text("It's OK"), "it's ok")
+    
+    def test_token_stream_offsets(self):
+        tokens = self.analyzer.tokenize('feeling  very calm')
+        
+        self.assertEqual(tokens.words, ['feeling', 'very', 'calm'])
+        self.assertEqual(tokens.offsets, [(0, 7), (9, 13), (14, 18)])
+        self.assertEqual(len(tokens), 3)
+
+    def test_emotional_intensity_counts_original_capitals(self):
+        text = 'I am SO ANGRY. Really!'
+        cleaned = self.analyzer.preprocess_text(text)
+        
+        calm = self.analyzer.analyze_emotional_intensity(cleaned)
+        shouted = self.analyzer.analyze_emotional_intensity(cleaned, original_text=text)
+        
+        self.assertAlmostEqual(shouted - calm, 0.2 * 9 / len(text))
+    
+    def test_multi_word_modifiers_and_phrases(self):
+        score = self.analyzer.psychology_weighted_analysis
+        
+        self.assertAlmostEqual(score('a bit stressed'), -2.2 * 0.6 / 3)
+        self.assertAlmostEqual(score('very stressed today'), -2.2 * 1.3 / 3)
+        self.assertAlmostEqual(score('totally burned out'), -2.4 * 1.4 / 3)
+        self.assertAlmostEqual(score('finally at peace'), 1.9 / 3)
+        self.assertAlmostEqual(score('very much grateful'), 2.0 / 3)
+    
+    def test_frozen_lexicon(self):
+        self.assertEqual(PSYCHOLOGY_LEXICON.get('burned out'), (VALENCE, -2.4))
+        self.assertEqual(PSYCHOLOGY_LEXICON.get('a little'), (MODIFIER, 0.6))
+        self.assertEqual(PSYCHOLOGY_LEXICON.lookup('table'), -1)
+        
+        # Single words are looked up directly; only phrases get trie nodes
+        self.assertNotIn('grateful', PSYCHOLOGY_LEXICON.phrase_trie)
+        self.assertIn('burned', PSYCHOLOGY_LEXICON.phrase_trie)
+        
+        with self.assertRaises(AttributeError):
+            PSYCHOLOGY_LEXICON.version = '2'
+        
+        copy = pickle.loads(pickle.dumps(PSYCHOLOGY_LEXICON))
+        self.assertEqual(list(copy.terms()), list(PSYCHOLOGY_LEXICON.terms()))
+    
+    def test_custom_lexicon(self):
+        lexicon = Lexicon('test', valence={'Sunny Day': 3.0}, modifiers={'so': 2.0})
+        analyzer = SentimentAnalyzer(lexicon=lexicon)
+        
+        self.assertAlmostEqual(analyzer.psychology_weighted_analysis('so sunny day'), 6.0 / 3)
+        self.assertEqual(analyzer.psychology_weighted_analysis('grateful'), 0.0)
+        self.assertNotEqual(analyzer.cache_namespace, self.analyzer.cache_namespace)
+    
+    def test_fast_profile_skips_textblob(self):
+        text = 'Feeling very hopeful and calm after therapy'
+        
+        full = self.analyzer.analyze(text)
+        fast = self.analyzer.analyze(text, profile='fast')
+        
+        self.assertEqual(full['stages'], ['vader', 'textblob', 'psychology', 'intensity'])
+        self.assertEqual(fast['stages'], ['vader', 'psychology'])
+        self.assertIsNone(fast['textblob_polarity'])
+        self.assertEqual(fast['sentiment_label'], full['sentiment_label'])
+        
+        with self.assertRaises(ValueError):
+            self.analyzer.analyze(text, profile=('vader', 'sarcasm'))
+    
+    def test_cascade_profile_runs_textblob_only_when_unsure(self):
+        confident = 'Feeling very hopeful and calm after therapy'
+        unsure = 'Pretty ordinary day, a bit tired but okay'
+        
+        result = self.analyzer.analyze(confident, profile='cascade')
+        self.assertNotIn('textblob', result['stages'])
+        self.assertEqual(result['sentiment_label'],
+                         self.analyzer.analyze(confident)['sentiment_label'])
+        
+        result = self.analyzer.analyze(unsure, profile='cascade')
+        self.assertEqual(result['stages'], ['vader', 'textblob', 'psychology', 'intensity'])
+        self.assertEqual(result, self.analyzer.analyze(unsure))
+    
+    def test_custom_scorer_and_weights(self):
+        analyzer = SentimentAnalyzer(weights={'vader': 1.0, 'textblob': 0.0,
+                                              'psychology': 0.0, 'intensity': 0.0})
+        analyzer.register_scorer('constant', lambda context: (1.0, {'constant': 1.0}), weight=0.5)
+        
+        result = analyzer.analyze('neutral words here', profile=('constant',))
+        
+        self.assertEqual(result['constant'], 1.0)
+        self.assertEqual(result['compound_score'], 1.0)
+        self.assertEqual(analyzer.calculate_combined_score(0.2, 0.9, 0.9, 0.9), 0.2 * 1.5)
+    
+    def test_analyze_batch_matches_analyze(self):
+        texts = [
+            'I feel grateful and proud of my progress',
+            'Overwhelmed, anxious and exhausted today',
+            'I feel grateful and proud of my progress',
+            ''
+        ]
+        
+        results = self.analyzer.analyze_batch(texts)
+        
+        self.assertEqual(results, [self.analyzer.analyze(text) for text in texts])
+    
+    def test_analyze_batch_process_pool_preserves_order(self):
+        texts = [f'Day {i}: feeling {"hopeful" if i % 2 else "hopeless"}' for i in range(8)]
+        texts.append(texts[0])
+        analyzer = SentimentAnalyzer(cache=LRUCache(max_size=16))
+        
+        results = analyzer.analyze_batch(texts, processes=2, chunksize=2)
+        
+        self.assertEqual([r['sentiment_label'] for r in results],
+                         [self.analyzer.analyze(text)['sentiment_label'] for text in texts])
+        
+        # Results are copies: mutating one affects neither duplicates nor the cache
+        label = results[0]['sentiment_label']
+        results[0]['sentiment_label'] = 'mutated'
+        self.assertEqual(results[-1]['sentiment_label'], label)
+        self.assertEqual(analyzer.analyze(texts[0])['sentiment_label'], label)
+
+    def test_cached_analysis(self):
+        analyzer = SentimentAnalyzer(cache=LRUCache(max_size=2))
+        
+        first = analyzer.analyze('Feeling hopeful today')
+        first['sentiment_label'] = 'mutated'
+        second = analyzer.analyze('  Feeling   hopeful today ')
+        
+        self.assertEqual(second, self.analyzer.analyze('Feeling hopeful today'))
+        self.assertEqual(analyzer.cache.stats()['hits'], 1)
+        self.assertEqual(analyzer.cache.stats()['misses'], 1)
+        
+        analyzer.analyze('one')
+        analyzer.analyze('two')
+        self.assertEqual(analyzer.cache.stats()['evictions'], 1)
+    
+    def test_persistent_cache_tier(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.db')
+            text = 'Overwhelmed but hopeful'
+            
+            expected = SentimentAnalyzer(cache=LRUCache(store=SQLiteStore(path))).analyze(text)
+            
+            restarted = SentimentAnalyzer(cache=LRUCache(store=SQLiteStore(path)))
+            self.assertEqual(restarted.analyze(text), expected)
+            self.assertEqual(restarted.cache.stats()['store_hits'], 1)
+
+if __name__ == '__main__':
+    unittest.main()